@@ -0,0 +1,255 @@
+# balance_estimator.py
+
+import time
+import argparse
+
+import numpy as np
+
+from enums_and_roles import Camp, Role
+from role_compositions import MAX_PLAYERS, MIN_PLAYERS, composition_for_human, max_wolves
+
+
+# Codes numériques des rôles (une case d'un tableau numpy par joueur)
+ROLES = list(Role)
+ROLE_CODES = {role: code for code, role in enumerate(ROLES)}
+IS_WOLF = np.array([role.camp == Camp.LOUP for role in ROLES])
+
+VILLAGE_WIN, WOLF_WIN = 0, 1
+
+
+def lobby_composition(num_players, num_wolves, human_role=Role.VILLAGEOIS):
+    """Composition complète d'une table du menu : rôle de l'humain + rôles des IA (catalogue)."""
+    return (human_role,) + composition_for_human(num_players, num_wolves, human_role)
+
+
+def _pick(rng, mask):
+    """Tire uniformément une case vraie par ligne de `mask` (dernier axe). -1 si la ligne est vide."""
+    keys = np.where(mask, rng.random(mask.shape), -1.0)
+    return np.where(mask.any(axis=-1), keys.argmax(axis=-1), -1)
+
+
+def _seat_of(roles, role):
+    """Siège du joueur ayant ce rôle dans chaque partie (-1 si le rôle n'est pas distribué)."""
+    is_role = roles == ROLE_CODES[role]
+    return np.where(is_role.any(axis=1), is_role.argmax(axis=1), -1)
+
+
+class _Batch:
+    """
+    Un lot de parties abstraites jouées en même temps : une ligne par partie, une colonne par siège.
+    Les parties terminées sont retirées du lot (`_keep`) pour que chaque jour ne coûte que
+    les parties encore en cours.
+    """
+
+    def __init__(self, codes, size, rng, mayor_double_vote):
+        self.rng = rng
+        self.mayor_double_vote = mayor_double_vote
+        num_players = codes.size
+
+        self.ids = np.arange(size)
+        # Distribution : une permutation aléatoire de la composition par partie
+        self.roles = codes[np.argsort(rng.random((size, num_players)), axis=1)]
+        self.wolf = IS_WOLF[self.roles]
+        self.alive = np.ones((size, num_players), dtype=bool)
+
+        self.hunter = self.roles == ROLE_CODES[Role.CHASSEUR]
+        self.salvateur_seat = _seat_of(self.roles, Role.SALVATEUR)
+        self.witch_seat = _seat_of(self.roles, Role.SORCIERE)
+        self.ancient_seat = _seat_of(self.roles, Role.ANCIEN)
+        self.mayor_seat = _seat_of(self.roles, Role.MAIRE)
+
+        # Pouvoirs à usage unique
+        self.hunter_shot = np.ones(size, dtype=bool)
+        self.life_potion = np.ones(size, dtype=bool)
+        self.ancient_shield = np.ones(size, dtype=bool)
+        self.last_protected = np.full(size, -1)
+
+        # Cupidon (IA) lie deux joueurs distincts au hasard, la première nuit
+        has_cupid = (self.roles == ROLE_CODES[Role.CUPIDON]).any(axis=1)
+        pair = np.argsort(rng.random((size, num_players)), axis=1)[:, :2]
+        self.lovers = np.where(has_cupid[:, None], pair, -1)
+
+    def __len__(self):
+        return self.ids.size
+
+    def _keep(self, mask):
+        for name in ("ids", "roles", "wolf", "alive", "hunter", "salvateur_seat", "witch_seat",
+                     "ancient_seat", "mayor_seat", "hunter_shot", "life_potion", "ancient_shield",
+                     "last_protected", "lovers"):
+            setattr(self, name, getattr(self, name)[mask])
+
+    def _seat_alive(self, seat):
+        rows = np.arange(len(self))
+        return (seat >= 0) & self.alive[rows, np.maximum(seat, 0)]
+
+    def check(self, day, max_days, winners, days):
+        """Conditions de victoire de GameManager.check_win_condition ; retire les parties finies."""
+        wolves = (self.alive & self.wolf).sum(axis=1)
+        villagers = (self.alive & ~self.wolf).sum(axis=1)
+        won = np.where(wolves == 0, VILLAGE_WIN, np.where(wolves >= villagers, WOLF_WIN, -1))
+        done = (won >= 0) | (day >= max_days)
+        winners[self.ids[done]] = won[done]
+        days[self.ids[done]] = day
+        self._keep(~done)
+
+    def resolve(self, dying):
+        """Morts en chaîne, par vagues : tir du Chasseur et chagrin de l'amoureux."""
+        rows = np.arange(len(self))
+        has_lovers = self.lovers[:, 0] >= 0
+        first, second = np.maximum(self.lovers[:, 0], 0), np.maximum(self.lovers[:, 1], 0)
+        while dying.any():
+            self.alive &= ~dying
+            chained = np.zeros_like(dying)
+
+            shooter = (dying & self.hunter).any(axis=1) & self.hunter_shot
+            if shooter.any():
+                self.hunter_shot &= ~shooter
+                shot = _pick(self.rng, self.alive & shooter[:, None])
+                hit = shot >= 0
+                chained[rows[hit], shot[hit]] = True
+
+            broken = has_lovers & dying[rows, first]
+            chained[rows[broken], second[broken]] = True
+            broken = has_lovers & dying[rows, second]
+            chained[rows[broken], first[broken]] = True
+
+            dying = chained & self.alive
+
+    def night(self):
+        """Nuits 2 et suivantes : Salvateur, Loups, Sorcière, totem de l'Ancien."""
+        rows = np.arange(len(self))
+        columns = np.arange(self.roles.shape[1])
+
+        # Salvateur : n'importe quel vivant sauf sa protection de la nuit précédente
+        salvateur_alive = self._seat_alive(self.salvateur_seat)
+        protected = _pick(self.rng, self.alive & (columns[None, :] != self.last_protected[:, None]))
+        protected = np.where(salvateur_alive, protected, -1)
+        self.last_protected = np.where(salvateur_alive & (protected >= 0), protected, self.last_protected)
+
+        # Loups : un vivant hors de leur camp
+        target = _pick(self.rng, self.alive & ~self.wolf)
+        attacked = (target >= 0) & (target != protected)
+
+        # Sorcière : potion de vie une fois, une chance sur deux
+        saved = attacked & self._seat_alive(self.witch_seat) & self.life_potion & (self.rng.random(len(self)) < 0.5)
+        self.life_potion &= ~saved
+        attacked &= ~saved
+
+        # L'Ancien survit à la première attaque des Loups
+        shielded = attacked & (target == self.ancient_seat) & self.ancient_shield
+        self.ancient_shield &= ~shielded
+        attacked &= ~shielded
+
+        dying = np.zeros_like(self.alive)
+        dying[rows[attacked], target[attacked]] = True
+        self.resolve(dying)
+
+    def vote(self):
+        """Chaque vivant vote pour un autre vivant ; majorité stricte, personne en cas d'égalité."""
+        size, num_players = self.alive.shape
+        rows = np.arange(size)
+        others = self.alive[:, None, :] & ~np.eye(num_players, dtype=bool)[None, :, :]
+        ballots = _pick(self.rng, others)
+
+        weights = (self.alive & (ballots >= 0)).astype(np.int64)
+        if self.mayor_double_vote:
+            mayor = self._seat_alive(self.mayor_seat)
+            weights[rows[mayor], self.mayor_seat[mayor]] *= 2
+
+        counts = np.zeros((size, num_players), dtype=np.int64)
+        np.add.at(counts, (np.repeat(rows, num_players), np.maximum(ballots, 0).ravel()), weights.ravel())
+        best = counts.max(axis=1)
+        lynched = ((counts == best[:, None]).sum(axis=1) == 1) & (best > 0)
+
+        dying = np.zeros_like(self.alive)
+        dying[rows[lynched], counts.argmax(axis=1)[lynched]] = True
+        self.resolve(dying)
+
+
+def simulate(composition, games=10000, seed=None, max_days=30, batch_size=8192, mayor_double_vote=False):
+    """
+    Joue `games` parties abstraites de la composition (agents aléatoires, comme RandomAgent).
+    Retourne (vainqueurs, jours) : tableaux numpy, vainqueur -1 si la partie atteint max_days.
+    `mayor_double_vote` : le vote du Maire compte double. Désactivé par défaut, comme dans GameManager
+    où le vote d'un Maire IA n'est jamais doublé (seul le Maire humain l'est).
+    """
+    rng = np.random.default_rng(seed)
+    codes = np.array([ROLE_CODES[role] for role in composition])
+    winners = np.full(games, -1, dtype=np.int8)
+    days = np.zeros(games, dtype=np.int16)
+
+    for start in range(0, games, batch_size):
+        size = min(batch_size, games - start)
+        batch = _Batch(codes, size, rng, mayor_double_vote)
+        batch_winners = np.full(size, -1, dtype=np.int8)
+        batch_days = np.zeros(size, dtype=np.int16)
+
+        # Même enchaînement que HeadlessGame : nuit blanche au jour 1, puis nuit, vote...
+        day = 1
+        while len(batch):
+            if day > 1:
+                batch.night()
+            day += 1
+            batch.check(day, max_days, batch_winners, batch_days)
+            if len(batch):
+                batch.vote()
+                batch.check(day, max_days, batch_winners, batch_days)
+
+        winners[start:start + size] = batch_winners
+        days[start:start + size] = batch_days
+    return winners, days
+
+
+def estimate(composition, games=10000, seed=None, max_days=30, mayor_double_vote=False):
+    """Probabilité de victoire de chaque camp pour une composition, avec la durée moyenne des parties."""
+    winners, days = simulate(composition, games, seed=seed, max_days=max_days,
+                             mayor_double_vote=mayor_double_vote)
+    return {
+        "composition": [role.name for role in composition],
+        "games": games,
+        Camp.VILLAGE.value: float(np.mean(winners == VILLAGE_WIN)),
+        Camp.LOUP.value: float(np.mean(winners == WOLF_WIN)),
+        "unfinished": float(np.mean(winners < 0)),
+        "mean_days": float(days.mean()),
+    }
+
+
+def estimate_lobbies(players=range(MIN_PLAYERS, MAX_PLAYERS + 1), wolves=None, human_role=Role.VILLAGEOIS,
+                     games=10000, seed=None, max_days=30, mayor_double_vote=False):
+    """
+    Estime chaque réglage du menu (nombre de joueurs x nombre de loups).
+    Sans `wolves`, tous les nombres de loups proposés par le menu sont essayés.
+    """
+    results = []
+    for num_players in players:
+        for num_wolves in wolves or range(1, max_wolves(num_players) + 1):
+            if num_wolves > max_wolves(num_players):
+                continue
+            result = estimate(lobby_composition(num_players, num_wolves, human_role), games,
+                              seed=seed, max_days=max_days, mayor_double_vote=mayor_double_vote)
+            result["num_players"] = num_players
+            result["num_wolves"] = num_wolves
+            results.append(result)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Estimation Monte-Carlo de l'équilibre des compositions.")
+    parser.add_argument("--players", type=int, nargs="+", default=list(range(MIN_PLAYERS, MAX_PLAYERS + 1)))
+    parser.add_argument("--wolves", type=int, nargs="+", default=None)
+    parser.add_argument("--human-role", default="VILLAGEOIS", choices=[role._name_ for role in Role])
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--max-days", type=int, default=30)
+    parser.add_argument("--mayor-double-vote", action="store_true",
+                        help="Le vote du Maire compte double (GameManager ne le fait que pour un Maire humain).")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = estimate_lobbies(args.players, args.wolves, Role[args.human_role], args.games,
+                               seed=args.seed, max_days=args.max_days, mayor_double_vote=args.mayor_double_vote)
+    for result in results:
+        print(f"{result['num_players']:>2} joueurs, {result['num_wolves']} loups : "
+              f"Villageois {result[Camp.VILLAGE.value]:.1%}, Loups {result[Camp.LOUP.value]:.1%}, "
+              f"{result['mean_days']:.1f} jours")
+    print(f"{len(results)} compositions x {args.games} parties en {time.perf_counter() - started:.1f}s")
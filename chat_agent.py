@@ -1,54 +1,51 @@
 
-from groq import Groq
 from dotenv import load_dotenv
 import os
 import json
-import random 
+import threading
 from enum import Enum 
 
 
 from enums_and_roles import Camp, NightAction, Role 
+from conversation_memory import ConversationMemory, PUBLIC_MESSAGE_PREFIX, is_summary
+from decision_runner import current_ticket
+from llm_backends import shared_backend
+from llm_scheduler import PRIORITY_NIGHT, PRIORITY_VOTE, PRIORITY_DEBATE
+from player_state import Player
 
 
-class Player:
-    def __init__(self, name, is_human=False):
-        self.name = name
-        self.is_human = is_human
-        self.role = None
-        self.is_alive = True
-        self.has_kill_potion = False 
-        self.has_life_potion = False 
-        self.wolf_teammates = [] 
-        self.has_hunter_shot = True
-        self.last_protected_target = None  # <-- AJOUT SALVATEUR
-        self.is_ancient_protected = False # <-- AJOUT ANCIEN
-        
-    def assign_role(self, role):
-        self.role = role
-        # Initialisation spécifique pour l'Ancien (qui survit à la première attaque)
-        if role == Role.ANCIEN:
-            self.is_ancient_protected = True 
-
 # --------------------------------------------------------
 
 class ChatAgent(Player):
     """
-    Représente un joueur IA. Gère l'historique isolé, la personnalité et l'API LLM (via Groq).
+    Représente un joueur IA. Gère l'historique isolé, la personnalité et l'API LLM
+    (via un LLMBackend : Groq par défaut, serveur local ou stub hors-ligne).
+    L'historique est lu et modifié depuis plusieurs threads (rendu, débat, votes, nuit) :
+    toute lecture ou écriture passe par `history_lock`.
     """
     
     
+    __slots__ = ("backend", "personality_context_path", "memory", "history", "history_lock")
+
     large_language_model = "llama-3.3-70b-versatile" 
+
+    # Taille maximale (estimée, en tokens) de l'historique envoyé au LLM
+    MEMORY_TOKEN_BUDGET = 1500
+    MEMORY_WINDOW = 12
     
-    def __init__(self, name, personality_context_path, is_human=False):
+    def __init__(self, name, personality_context_path, is_human=False, token_budget=None, backend=None):
         
-        super().__init__(name, is_human)
+        super().__init__(name, is_human=is_human)
         
-        if "GROQ_KEY" not in os.environ:
-             raise EnvironmentError("GROQ_KEY non trouvée. Assurez-vous d'avoir un fichier .env.")
-             
-        self.client = Groq(api_key=os.environ["GROQ_KEY"])
+        # Backend partagé par tous les agents du processus (LLM_BACKEND=stub permet de jouer hors-ligne)
+        self.backend = backend or shared_backend()
         self.personality_context_path = personality_context_path
+        self.memory = ConversationMemory(
+            window_size=self.MEMORY_WINDOW,
+            token_budget=token_budget or self.MEMORY_TOKEN_BUDGET
+        )
         self.history = [] 
+        self.history_lock = threading.RLock()
         self.initiate_history()
 
     
@@ -64,7 +61,22 @@ class ChatAgent(Player):
             "Réponds avec une seule phrase courte (maximum 10-15 mots). Sois extrêmement concis et direct. "
             "Voici ta personnalité : \n" + personality_context
         )
-        self.history = [{"role": "system", "content": system_instruction}]
+        with self.history_lock:
+            self.history = [{"role": "system", "content": system_instruction}]
+            self.memory.reset()
+
+    def on_new_day(self, day):
+        """Les échanges résumés à partir de maintenant sont rattachés à ce jour."""
+        self.memory.new_day(day)
+
+    def prompt_tokens(self):
+        """Taille estimée (en tokens) de l'historique envoyé à chaque appel."""
+        return self.memory.count_tokens(self.history_snapshot())
+
+    def history_snapshot(self):
+        """Copie de l'historique, cohérente même si un autre thread est en train de le modifier."""
+        with self.history_lock:
+            return list(self.history)
 
     @staticmethod
     def _read_file(file_path):
@@ -78,12 +90,14 @@ class ChatAgent(Player):
 
 
     def _update_history(self, role, content):
-         """Ajoute une interaction à l'historique isolé."""
-         self.history.append(
-                     {
-                         "role": role,
-                         "content": content,
-                     })
+         """Ajoute une interaction à l'historique isolé (borné par la mémoire de l'agent)."""
+         with self.history_lock:
+             self.history.append(
+                         {
+                             "role": role,
+                             "content": content,
+                         })
+             self.memory.compact(self.history)
                      
     def _normalize_history(self, history_to_normalize):
         """Convertit les messages multimodaux (non supportés par ce modèle) en messages texte."""
@@ -103,51 +117,104 @@ class ChatAgent(Player):
 
     
 
+    def _push_prompt(self, user_interaction):
+        """Ajoute le prompt à l'historique et retourne la conversation à envoyer, en une seule prise du verrou."""
+        with self.history_lock:
+            self._update_history(role="user", content=user_interaction)
+            return self._normalize_history(self.history)
+
     def ask_llm(self, user_interaction):
         """Mode Texte Simple : Envoie l'interaction LLM et met à jour l'historique."""
-        self._update_history(role="user", content=user_interaction)
-        normalized_history = self._normalize_history(self.history)
+        return self._complete_conversation(self._push_prompt(user_interaction))
 
+    def _complete_conversation(self, normalized_history):
+        """Envoie une conversation déjà enregistrée (verrou relâché pendant l'appel) et mémorise la réponse."""
         try:
-            response = self.client.chat.completions.create(
+            response = self.backend.complete(
                 messages=normalized_history,
                 model=self.large_language_model, 
-                temperature=0.9 
-            ).choices[0].message.content
+                temperature=0.9,
+                priority=PRIORITY_DEBATE
+            )
             
             self._update_history(role="assistant", content=response)
             return response
             
         except Exception as e:
-            print(f"Erreur GROQ API (LLM) : {e}")
+            print(f"Erreur API LLM : {e}")
             return f"[ERREUR LLM : Échec de la communication. {e}]"
 
 
+    def ask_llm_stream(self, user_interaction):
+        """
+        Mode Streaming : comme ask_llm, mais produit la réponse morceau par morceau dès leur arrivée.
+        L'historique n'est mis à jour qu'une fois la réponse complète.
+        """
+        return self._stream_conversation(self._push_prompt(user_interaction))
+
+    def _stream_conversation(self, normalized_history):
+        """Version streamée de _complete_conversation."""
+        chunks = []
+        try:
+            for delta in self.backend.stream(
+                messages=normalized_history,
+                model=self.large_language_model, 
+                temperature=0.9,
+                priority=PRIORITY_DEBATE
+            ):
+                chunks.append(delta)
+                yield delta
+                    
+        except Exception as e:
+            print(f"Erreur API LLM (stream) : {e}")
+            if not chunks:
+                yield f"[ERREUR LLM : Échec de la communication. {e}]"
+                return
+
+        self._update_history(role="assistant", content="".join(chunks))
+
     def receive_public_message(self, sender_name, message):
          """Enregistre un message public du débat dans l'historique de l'IA."""
          public_interaction = f"Message public de {sender_name}: {message}"
          self._update_history(role="user", content=public_interaction)
 
-    def _prompt_llm_for_decision(self, prompt, model):
-         """Fonction utilitaire pour obtenir une réponse concise (Nom de la cible ou du votant)."""
-         self._update_history(role="user", content=prompt)
-         normalized_history = self._normalize_history(self.history)
+    def _prompt_llm_for_decision(self, prompt, model, priority=PRIORITY_VOTE):
+         """
+         Fonction utilitaire pour obtenir une réponse concise (Nom de la cible ou du votant).
+         `priority` place l'appel dans la file de l'ordonnanceur (nuit > vote > débat).
+         Le prompt et la réponse ne sont écrits dans l'historique qu'au retour du LLM, et seulement
+         si l'appel n'a pas été abandonné entre-temps (décision hors délai, voir decision_runner).
+         """
+         prompt_message = {"role": "user", "content": prompt}
+         normalized_history = self._normalize_history(self.history_snapshot() + [prompt_message])
           
          try:
-             response = self.client.chat.completions.create(
+             response = self.backend.complete(
                  messages=normalized_history,
                  model=model,
                  max_tokens=30, 
-                 temperature=0.7 
-             ).choices[0].message.content
+                 temperature=0.7,
+                 priority=priority
+             )
              
-             self._update_history(role="assistant", content=f"Décision interne: {response}")
+             self._record_decision(prompt, f"Décision interne: {response}")
              return response.strip()
          except Exception as e:
-             print(f"Erreur GROQ API (Décision) : {e}")
+             print(f"Erreur API LLM (Décision) : {e}")
+             self._record_decision(prompt)
              # Retourne une cible aléatoire en cas d'erreur de l'API
              return "Alice" 
 
+    def _record_decision(self, prompt, answer=None):
+         """Enregistre un échange de décision, sauf si l'appel en cours a été abandonné par son lanceur."""
+         ticket = current_ticket()
+         with self.history_lock:
+             if ticket is not None and not ticket.commit():
+                 return
+             self._update_history(role="user", content=prompt)
+             if answer is not None:
+                 self._update_history(role="assistant", content=answer)
+
     def decide_night_action(self, alive_players):
          """Demande au LLM de choisir une cible pour son action de nuit."""
          if self.role.night_action == NightAction.NONE:
@@ -166,7 +233,7 @@ class ChatAgent(Player):
              f"RÉPONDS UNIQUEMENT AVEC LE NOM DU JOUEUR CIBLÉ. (Ex: Alice)"
          )
          
-         target_name = self._prompt_llm_for_decision(prompt, self.large_language_model)
+         target_name = self._prompt_llm_for_decision(prompt, self.large_language_model, priority=PRIORITY_NIGHT)
          return target_name
 
     def decide_vote(self, public_status, debate_summary):
@@ -187,35 +254,126 @@ class ChatAgent(Player):
              "RÈGLE IMPÉRATIVE : NE RÉPONDS QU'AVEC LE NOM DU JOUEUR CHOISI. Pas de phrase, pas d'explication, juste le nom."
          )
          
-         voted_name = self._prompt_llm_for_decision(prompt, self.large_language_model)
+         voted_name = self._prompt_llm_for_decision(prompt, self.large_language_model, priority=PRIORITY_VOTE)
          
          
          if voted_name and voted_name in alive_names:
              return voted_name
          
          if alive_names:
-              return random.choice(alive_names)
+              return self.rng.choice(alive_names)
               
          return None
 
+    @classmethod
+    def decide_votes_batched(cls, voters, public_status, recent_messages=8):
+         """
+         Vote groupé : UN SEUL appel LLM pour tous les votants IA du tour.
+         Le prompt contient la perspective privée de chaque votant (rôle, coéquipiers, visions) et
+         demande une table JSON {votant: cible}. Chaque cible est validée contre la liste des vivants ;
+         une réponse absente ou invalide est remplacée par un vote aléatoire (comme decide_vote).
+         Retourne les bulletins dans l'ordre des votants.
+         """
+         alive_names = [p['name'] for p in public_status if p['is_alive']]
+         candidates_by_voter = {v.name: [n for n in alive_names if n != v.name] for v in voters}
+
+         # Le débat est public : l'historique du premier votant suffit
+         debate = [
+             msg['content'][len(PUBLIC_MESSAGE_PREFIX):] for msg in voters[0].history_snapshot()
+             if msg['role'] == 'user' and str(msg['content']).startswith(PUBLIC_MESSAGE_PREFIX)
+         ][-recent_messages:]
+
+         perspectives = []
+         for voter in voters:
+             # Connaissances privées = messages système épinglés (sauf la personnalité et le résumé)
+             secrets = [
+                 str(msg['content'])[:160].rstrip(". ") for msg in voter.history_snapshot()[1:]
+                 if msg['role'] == 'system' and not is_summary(msg)
+             ]
+             perspectives.append(
+                 f'- Votant "{voter.name}" ({voter.role.name}, camp {voter.role.camp.value}). '
+                 f'Il sait : {" / ".join(secrets) or "rien de plus"}. '
+                 f'cibles possibles : {", ".join(candidates_by_voter[voter.name])}'
+             )
+
+         prompt = (
+             "C'est la phase de vote du Loup Garou. Tu décides du vote de CHAQUE joueur ci-dessous, "
+             "en respectant uniquement SA perspective : un Loup-Garou ne vote jamais contre ses coéquipiers, "
+             "un Villageois vote contre le joueur le plus suspect.\n"
+             f"Débat récent :\n- " + ("\n- ".join(debate) or "(aucun message)") + "\n"
+             "Votants :\n" + "\n".join(perspectives) + "\n"
+             'RÉPONDS UNIQUEMENT AVEC UN OBJET JSON {"nom du votant": "nom de la cible", ...}.'
+         )
+
+         backend = voters[0].backend
+         try:
+             response = backend.complete(
+                 messages=[{"role": "user", "content": prompt}],
+                 model=cls.large_language_model,
+                 max_tokens=30 * len(voters),
+                 temperature=0.7,
+                 json_mode=True,
+                 priority=PRIORITY_VOTE
+             )
+             start, end = response.find("{"), response.rfind("}")
+             votes = json.loads(response[start:end + 1]) if start != -1 else {}
+             if not isinstance(votes, dict):
+                 votes = {}
+         except Exception as e:
+             print(f"Erreur API LLM (Vote groupé) : {e}")
+             votes = {}
+
+         ballots = []
+         for voter in voters:
+             voted_name = votes.get(voter.name)
+             candidates = candidates_by_voter[voter.name]
+             if voted_name not in candidates:
+                 voted_name = voter.rng.choice(candidates) if candidates else None
+             ballots.append(voted_name)
+
+         # Vote abandonné par son lanceur (hors délai) : aucune décision n'est écrite
+         ticket = current_ticket()
+         if ticket is None or ticket.commit():
+             for voter, voted_name in zip(voters, ballots):
+                 if voted_name:
+                     with voter.history_lock:
+                         voter._update_history(role="assistant", content=f"Décision interne: {voted_name}")
+         return ballots
+
     def generate_debate_message(self, current_game_status):
          """
          Génère un message de débat public, forçant l'IA à être active, accusatrice ou à révéler sa preuve.
+         Appelé sur le thread de débat pendant que le thread de rendu transmet les messages publics :
+         le prompt est construit et enregistré sous le verrou, l'appel LLM se fait verrou relâché.
          """
-         
+         return self._complete_conversation(self._push_debate_prompt(current_game_status))
+
+    def stream_debate_message(self, current_game_status):
+         """Version streamée de generate_debate_message : produit le message morceau par morceau."""
+         return self._stream_conversation(self._push_debate_prompt(current_game_status))
+
+    def _push_debate_prompt(self, current_game_status):
+         """Construit le prompt de débat et l'ajoute à l'historique sans qu'un message public s'intercale."""
+         with self.history_lock:
+             return self._push_prompt(self._build_debate_prompt(current_game_status))
+
+    def _build_debate_prompt(self, current_game_status):
+         """Construit le prompt de débat selon la situation de l'IA (accusée, Voyante avec preuve, ou attaquante)."""
          alive_names = [p['name'] for p in current_game_status if p['is_alive'] and p['name'] != self.name]
+         history = self.history_snapshot()
          
-         is_accused = any(self.name in msg['content'] for msg in self.history[-5:] if msg['role'] == 'user')
+         is_accused = any(self.name in msg['content'] for msg in history[-5:] if msg['role'] == 'user')
          
          is_voyante = (self.role.name == "Voyante")
+         # Le résumé glissant peut citer "Loup" et "vu" : seules les visions épinglées comptent
          found_wolf_info = next((
-             msg['content'] for msg in self.history 
-             if msg['role'] == 'system' and "Loup" in msg['content'] and "vu" in msg['content']
+             msg['content'] for msg in history 
+             if msg['role'] == 'system' and not is_summary(msg) and "Loup" in msg['content'] and "vu" in msg['content']
          ), None)
          
          # NOUVEAU : Extrait et résume les 10 dernières interactions du débat 
          recent_debate = [
-             msg['content'] for msg in self.history[-10:] 
+             msg['content'] for msg in history[-10:] 
              if msg['role'] == 'user' and not msg['content'].startswith("TON RÔLE") and not msg['content'].startswith("Décision interne")
          ]
          debate_summary = "\n- ".join(recent_debate)
@@ -256,6 +414,4 @@ class ChatAgent(Player):
              f"{instruction} {general_instruction}"
          )
          
-         debate_message = self.ask_llm(user_interaction=prompt)
-         
-         return debate_message
\ No newline at end of file
+         return prompt
@@ -0,0 +1,118 @@
+# conversation_memory.py
+
+# En-tête du message système qui porte le résumé glissant (permet de le retrouver dans l'historique)
+SUMMARY_HEADER = "RÉSUMÉ DE LA PARTIE (messages plus anciens) :"
+
+PUBLIC_MESSAGE_PREFIX = "Message public de "
+DECISION_PREFIX = "Décision interne: "
+
+
+def is_summary(message):
+    """Vrai pour le message système du résumé glissant (ce n'est ni une consigne ni un secret épinglé)."""
+    return message["role"] == "system" and str(message["content"]).startswith(SUMMARY_HEADER)
+
+
+class ConversationMemory:
+    """
+    Mémoire bornée d'un ChatAgent.
+    - Les messages système (personnalité, rôle, coéquipiers loups, visions de la Voyante) sont épinglés.
+    - Seuls les `window_size` derniers échanges sont conservés tels quels.
+    - Les échanges plus anciens sont repliés dans un résumé compact, jour par jour.
+    - `token_budget` borne la taille estimée de la requête envoyée au LLM.
+    """
+
+    MIN_WINDOW = 2  # On garde toujours au moins la question en cours et le message précédent
+
+    def __init__(self, window_size=12, token_budget=1500, snippet_chars=80,
+                 max_snippets_per_day=6, max_summary_days=4):
+        self.window_size = window_size
+        self.token_budget = token_budget
+        self.snippet_chars = snippet_chars
+        self.max_snippets_per_day = max_snippets_per_day
+        self.max_summary_days = max_summary_days
+        self.day = 0
+        self.day_summaries = {}  # jour -> liste d'extraits ("Oggy: Zinzin ment !")
+
+    def reset(self):
+        """Oublie le résumé (nouvelle partie)."""
+        self.day = 0
+        self.day_summaries = {}
+
+    def new_day(self, day):
+        """Les messages repliés à partir de maintenant sont rangés sous ce jour."""
+        self.day = day
+
+    @staticmethod
+    def estimate_tokens(message):
+        """Estimation grossière (≈ 4 caractères par token + surcoût du message)."""
+        return len(str(message["content"])) // 4 + 4
+
+    def count_tokens(self, history):
+        """Taille estimée (en tokens) d'un historique complet."""
+        return sum(self.estimate_tokens(m) for m in history)
+
+    def compact(self, history):
+        """
+        Réduit l'historique sur place pour respecter la fenêtre et le budget de tokens.
+        L'historique est reconstruit d'un bloc : l'appelant doit tenir le verrou de l'historique
+        (ChatAgent.history_lock), sinon un ajout fait pendant la reconstruction serait perdu.
+        """
+        pinned = [m for m in history if m["role"] == "system" and not is_summary(m)]
+        turns = [m for m in history if m["role"] != "system"]
+
+        # 1. Fenêtre glissante
+        overflow = len(turns) - self.window_size
+        if overflow > 0:
+            for message in turns[:overflow]:
+                self._fold(message)
+            turns = turns[overflow:]
+
+        # 2. Budget de tokens : on replie les plus anciens échanges de la fenêtre
+        pinned_tokens = self.count_tokens(pinned)
+        turns_tokens = self.count_tokens(turns)
+        summary = self._summary_message()
+        while (len(turns) > self.MIN_WINDOW and
+               pinned_tokens + turns_tokens + (self.estimate_tokens(summary) if summary else 0) > self.token_budget):
+            oldest = turns.pop(0)
+            turns_tokens -= self.estimate_tokens(oldest)
+            self._fold(oldest)
+            summary = self._summary_message()
+
+        history[:] = pinned + ([summary] if summary else []) + turns
+
+    def _fold(self, message):
+        """Transforme un échange en extrait court et l'ajoute au résumé du jour."""
+        content = str(message["content"])
+
+        if message["role"] == "assistant":
+            if content.startswith(DECISION_PREFIX):
+                snippet = "moi (décision) : " + content[len(DECISION_PREFIX):]
+            else:
+                snippet = "moi : " + content
+        elif content.startswith(PUBLIC_MESSAGE_PREFIX):
+            snippet = content[len(PUBLIC_MESSAGE_PREFIX):]
+        else:
+            # Consignes de jeu (prompts de vote, de nuit, de débat) : déjà obsolètes
+            return
+
+        snippet = " ".join(snippet.split())
+        if len(snippet) > self.snippet_chars:
+            snippet = snippet[:self.snippet_chars - 1] + "…"
+
+        snippets = self.day_summaries.setdefault(self.day, [])
+        snippets.append(snippet)
+        # Résumé glissant : on ne garde que les extraits les plus récents de chaque jour
+        del snippets[:-self.max_snippets_per_day]
+
+        for old_day in sorted(self.day_summaries)[:-self.max_summary_days]:
+            del self.day_summaries[old_day]
+
+    def _summary_message(self):
+        """Construit le message système de résumé (ou None si rien n'a été replié)."""
+        if not self.day_summaries:
+            return None
+        lines = [SUMMARY_HEADER]
+        for day in sorted(self.day_summaries):
+            label = f"Jour {day}" if day else "Avant la partie"
+            lines.append(f"- {label} : " + " | ".join(self.day_summaries[day]))
+        return {"role": "system", "content": "\n".join(lines)}
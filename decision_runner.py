@@ -0,0 +1,122 @@
+# decision_runner.py
+
+import time
+import itertools
+import threading
+from concurrent.futures import Future, FIRST_COMPLETED, wait
+
+
+class CallAbandoned(Exception):
+    """Levée dans un appel abandonné par son lanceur (ex. requête LLM retirée de la file d'attente)."""
+
+
+class CallTicket:
+    """
+    Jeton d'un appel d'agent lancé par run_decisions. L'appel et son lanceur se disputent le jeton :
+    - l'agent le « valide » (commit) au moment d'écrire sa décision dans son historique ;
+    - le lanceur l'« abandonne » (abandon) quand l'appel dépasse son délai.
+    Le premier qui agit gagne : une décision abandonnée n'écrit jamais dans l'historique, et une
+    décision validée est toujours utilisée par le lanceur.
+    """
+
+    __slots__ = ("_lock", "_state")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = None  # None, "committed" ou "abandoned"
+
+    def commit(self):
+        """(Thread de l'appel) Vrai si la décision peut être enregistrée (appel non abandonné)."""
+        with self._lock:
+            if self._state is None:
+                self._state = "committed"
+            return self._state == "committed"
+
+    def abandon(self):
+        """(Lanceur) Vrai si l'appel est bien abandonné ; faux s'il a déjà validé sa décision."""
+        with self._lock:
+            if self._state is None:
+                self._state = "abandoned"
+            return self._state == "abandoned"
+
+    @property
+    def abandoned(self):
+        return self._state == "abandoned"
+
+
+_local = threading.local()
+_thread_ids = itertools.count()
+
+
+def current_ticket():
+    """Jeton de l'appel exécuté par ce thread (None hors de run_decisions)."""
+    return getattr(_local, "ticket", None)
+
+
+def _call(future, ticket, function, args):
+    if not future.set_running_or_notify_cancel():
+        return
+    _local.ticket = ticket
+    try:
+        result = function(*args)
+    except BaseException as error:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+def _start(function, args, name):
+    future, ticket = Future(), CallTicket()
+    # Thread démon par appel : un LLM retardataire ne retient ni un pool ni la fermeture du programme
+    threading.Thread(target=_call, args=(future, ticket, function, args),
+                     name=f"{name}-{next(_thread_ids)}", daemon=True).start()
+    return future, ticket
+
+
+def run_decisions(calls, timeout, max_workers=8, deadline=None, should_stop=None, name="decision"):
+    """
+    Exécute les décisions `calls` (liste de (fonction, args)) et retourne, dans le même ordre,
+    une liste de (répondu, valeur).
+    - Au plus `max_workers` appels actifs ; les suivants démarrent dès qu'une place se libère.
+    - Chaque appel dispose de `timeout` secondes à partir de son démarrage, sans dépasser `deadline`
+      (time.monotonic()). Hors délai, l'appel est abandonné et sa place libérée.
+    - Si should_stop() répond vrai, tous les appels en cours sont abandonnés.
+    Un appel abandonné, en erreur ou jamais démarré donne (False, None) : à l'appelant de choisir
+    une décision de secours.
+    """
+    results = [(False, None)] * len(calls)
+    waiting = list(range(len(calls)))[::-1]  # Pile : le prochain appel à démarrer est à la fin
+    running = {}  # index -> (future, ticket, échéance)
+
+    def collect(index, future):
+        if future.exception() is None:
+            results[index] = (True, future.result())
+
+    while waiting or running:
+        now = time.monotonic()
+        if (should_stop is not None and should_stop()) or (deadline is not None and now >= deadline):
+            for index, (future, ticket, _) in running.items():
+                if not ticket.abandon():
+                    collect(index, future)  # Décision validée juste avant l'arrêt : elle se termine
+            break
+
+        while waiting and len(running) < max_workers:
+            index = waiting.pop()
+            end = now + timeout if deadline is None else min(now + timeout, deadline)
+            running[index] = _start(*calls[index], name) + (end,)
+
+        for index, (future, ticket, end) in list(running.items()):
+            if future.done():
+                del running[index]
+                collect(index, future)
+            elif now >= end:
+                del running[index]
+                if not ticket.abandon():
+                    collect(index, future)
+
+        if running:
+            next_end = min(end for _, _, end in running.values())
+            # Attente par tranches courtes pour réagir vite à une annulation
+            wait([future for future, _, _ in running.values()], return_when=FIRST_COMPLETED,
+                 timeout=min(0.1, max(0.0, next_end - time.monotonic())))
+    return results
@@ -14,6 +14,23 @@ class NightAction(Enum):
     PAIR = 4         # Cupidon
     PROTECT = 5      # Salvateur
 
+# --- Causes de Mort ---
+class DeathCause(Enum):
+    WOLVES = "tué par les Loups"
+    LYNCH = "lynché(e) par le village"
+    HUNTER = "emporté(e) par le Chasseur"
+    HEARTBREAK = "mort de chagrin d'amour"
+    POISON = "empoisonné(e) par la Sorcière"
+
+    @property
+    def label(self):
+        return self.value
+
+    @property
+    def blocked_by_ancient_shield(self):
+        # Le totem de l'Ancien ne le protège que de l'attaque nocturne des Loups
+        return self == DeathCause.WOLVES
+
 # --- Définition des Rôles et de leurs Attributs ---
 class Role(Enum):
     # --- Villageois Simples ---
@@ -0,0 +1,40 @@
+# event_bus.py
+
+import queue
+from enum import Enum
+
+
+class UIEvent(Enum):
+    LOG = "log"                              # message : ligne à ajouter au journal de bord
+    NIGHT_PROGRESS = "night_progress"        # role, game : rôle qui commence son action de nuit
+    NIGHT_DONE = "night_done"                # message, game : résumé de la nuit calculée en arrière-plan
+    SPEECH_RECOGNIZED = "speech_recognized"  # text : phrase reconnue, à placer dans le champ de chat
+    LISTENING_STOPPED = "listening_stopped"  # le micro est libéré
+
+
+class EventBus:
+    """
+    File d'événements des threads de travail (nuit, reconnaissance vocale...) vers la boucle de rendu.
+    Les threads ne font que `post` ; seul le thread d'Arcade (on_update) lit la file avec `drain`
+    et modifie l'état de l'interface. La file (queue.SimpleQueue) n'a pas de verrou côté Python.
+    """
+
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+
+    def post(self, event_type, **data):
+        """(N'importe quel thread) Dépose un événement typé."""
+        self._queue.put((event_type, data))
+
+    def drain(self, max_events=None):
+        """(Thread de rendu) Retire au plus `max_events` événements, dans l'ordre d'arrivée."""
+        events = []
+        while max_events is None or len(events) < max_events:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+    def __len__(self):
+        return self._queue.qsize()
@@ -3,34 +3,34 @@
 import random
 import time 
 import os 
-from collections import defaultdict 
+from collections import defaultdict, namedtuple 
 import json 
-from enums_and_roles import Camp, NightAction, Role 
+from contextlib import nullcontext
+from enums_and_roles import Camp, DeathCause, NightAction, Role 
+from llm_cassette import active_cassette
+from player_registry import PlayerRegistry
+from role_compositions import composition_for_human, default_composition
+from player_state import Player, grant_role_powers
+from seeded_random import SeededRandom
+from game_events import EventLog, EventType, JsonlEventSink, role_key
+from decision_runner import run_decisions
 
 try:
     from chat_agent import ChatAgent
 except ImportError:
-    class ChatAgent(object):
+    class ChatAgent(Player):
+        __slots__ = ("history",)
+
         def __init__(self, name, personality_context_path):
-            self.name = name
-            self.is_human = False
-            self.role = None
-            self.is_alive = True
-            self.has_acted_this_night = False
-            self.has_kill_potion = False
-            self.has_life_potion = False
-            self.wolf_teammates = []
-            self.has_hunter_shot = True
-            self.last_protected_target = None
-            self.is_ancient_protected = False
+            super().__init__(name, is_human=False)
             self.history = []
-        def assign_role(self, role): self.role = role
+        def on_new_day(self, day): pass
         def receive_public_message(self, speaker, message): pass
-        def decide_night_action(self, alive_players): return random.choice([p.name for p in alive_players if p.name != self.name])
+        def decide_night_action(self, alive_players): return self.rng.choice([p.name for p in alive_players if p.name != self.name])
         def generate_debate_message(self, public_status): return "Je pense que nous devrions être prudents."
         def decide_vote(self, public_status, debate_summary): 
             alive_names = [p['name'] for p in public_status if p['is_alive'] and p['name'] != self.name]
-            return random.choice(alive_names) if alive_names else None
+            return self.rng.choice(alive_names) if alive_names else None
 
 
 # LISTE DE NOMS ALÉATOIRES POUR LES IA
@@ -52,31 +52,8 @@ IA_NAMES_POOL = [
     "Indominous",
 ]
 
-
-# --- CLASSE PLAYER (NON IA) ---
-
-class Player:
-    """Représente un joueur humain (ou la base pour ChatAgent)."""
-    def __init__(self, name, role=None, is_human=False):
-        self.name = name
-        self.is_human = is_human
-        self.role = role
-        self.is_alive = True
-        self.has_kill_potion = True
-        self.has_life_potion = True
-        self.wolf_teammates = [] 
-        self.has_hunter_shot = True
-        self.last_protected_target = None
-        self.is_ancient_protected = False
-
-    def assign_role(self, role):
-        self.role = role
-        if role == Role.ANCIEN:
-            self.is_ancient_protected = True
-    
-    def __repr__(self):
-        status = "Vivant" if self.is_alive else "Mort"
-        return f"[{'Humain' if self.is_human else 'IA'}] {self.name} ({self.role.name if self.role else 'N/A'} - {status})"
+# Issue d'une mort résolue (joueur, rôle, DeathCause, joueur à l'origine de la chaîne, survie grâce au totem)
+DeathOutcome = namedtuple("DeathOutcome", ["player", "role", "cause", "source", "survived"])
 
 
 # --- CLASSE GAMEMANAGER ---
@@ -85,11 +62,46 @@ class GameManager:
     """Gère le déroulement et la logique du jeu."""
     
     DEBATE_TIME_LIMIT = 20
+
+    # --- Collecte des votes IA ---
+    CONCURRENT_VOTES = True   # Interroge toutes les IA en parallèle
+    VOTE_MAX_WORKERS = 8      # Nombre maximum d'appels LLM simultanés
+    VOTE_TIMEOUT = 15         # Délai maximum (secondes) accordé à chaque bulletin
+    BATCHED_VOTES = False     # Un seul appel LLM pour tous les votes IA du tour
+    NIGHT_ACTION_TIMEOUT = 20 # Délai maximum (secondes) accordé à chaque décision de nuit d'une IA (avec échéance)
+
+    EVENTS_IN_MEMORY = 10000  # Événements gardés en mémoire (les plus récents) ; le sink garde tout
     
-    def __init__(self, human_player_name="Lucie", num_players_total=11, difficulty="NORMAL"):
+    def __init__(self, human_player_name="Lucie", num_players_total=11, difficulty="NORMAL", seed=None,
+                 agent_factory=None, event_sink=None):
+        # Graine de la partie : la cassette LLM active (enregistrement/rejeu) en fournit une par partie
+        # (chaque nouvelle partie de la session a sa propre distribution, retrouvée dans l'ordre au rejeu).
+        # Tout le hasard de la partie (rôles, noms, Cupidon, Chasseur, Sorcière, orateurs...) est tiré
+        # de self.rng : plusieurs parties peuvent tourner dans le même processus sans se perturber.
+        cassette = active_cassette()
+        if cassette is not None:
+            seed = cassette.next_seed(seed)
+        if seed is None:
+            seed = random.SystemRandom().randrange(2 ** 32)
+        self.seed = seed
+        self.rng = SeededRandom(seed)
+
+        # Fabrique des joueurs IA : agent_factory(name, context_path) (ChatAgent par défaut)
+        self.agent_factory = agent_factory or ChatAgent
+
+        # Journal d'événements typés (GAME_EVENT_LOG=chemin.jsonl pour l'écrire sur disque).
+        # Le fichier ouvert ici appartient à la partie : close() le referme.
+        owns_sink = event_sink is None and bool(os.environ.get("GAME_EVENT_LOG"))
+        if owns_sink:
+            event_sink = JsonlEventSink(os.environ["GAME_EVENT_LOG"])
+        self.events = EventLog(event_sink, max_in_memory=self.EVENTS_IN_MEMORY, owns_sink=owns_sink)
+        self._winner_announced = False
+
         self.difficulty = difficulty
         self.day = 0
         self.players = []
+        # Index nom/rôle/vivants tenu à jour à chaque rôle attribué et à chaque mort
+        self.registry = PlayerRegistry(self.players)
         self.debate_duration = 60 
         self.num_players_total = num_players_total
         
@@ -106,18 +118,22 @@ class GameManager:
         self.ancient_shield_triggered = False
 
         self.hunter_just_shot = False
+        self.last_death_outcomes = []
         
-        self.available_roles = self._adjust_roles() 
+        # Composition par défaut (tuple de Role), lue dans le catalogue précalculé
+        self.available_roles = default_composition(num_players_total)
         
         self.human_player = None 
         
         self._setup_players(human_player_name) 
         
         self.human_player = next((p for p in self.players if p.is_human), None)
+
+        self._emit(EventType.GAME_STARTED, seed=self.seed,
+                   players=[{"name": p.name, "is_human": p.is_human} for p in self.players])
         
         self._distribute_roles()
         
-        self._recalculate_wolf_count() 
         self.vote_counts = defaultdict(int)
         
         # --- Attributs de Nuit globaux ---
@@ -136,9 +152,41 @@ class GameManager:
         if p1 and p2:
             p1.is_in_love = True
             p2.is_in_love = True
+            self._emit(EventType.LOVERS_BOUND, lovers=[name1, name2])
             return f"💘 {name1} et {name2} sont maintenant amoureux !"
         return "L'amour a échoué..."
     
+    def _emit(self, event_type, **data):
+        """Ajoute un événement au journal de la partie."""
+        return self.events.emit(event_type, self.day, **data)
+
+    def close(self):
+        """Vide le journal d'événements et ferme le fichier GAME_EVENT_LOG ouvert par cette partie."""
+        self.events.close()
+
+    @staticmethod
+    def _add_private_note(player, content):
+        """Épingle une information secrète (rôle, coéquipiers, vision) dans l'historique d'une IA."""
+        # Les agents LLM protègent leur historique par un verrou (votes, débat et nuit en parallèle)
+        with getattr(player, "history_lock", None) or nullcontext():
+            player.history.append({"role": "system", "content": content})
+
+    def _emit_roles(self):
+        """Journalise une distribution des rôles (initial : les capacités des rôles sont accordées)."""
+        for p in self.players:
+            self._emit(EventType.ROLE_DEALT, player=p.name, role=role_key(p.role), initial=True)
+
+    def use_kill_potion(self, witch, target_name):
+        """Potion de mort de la Sorcière : consomme la potion, journalise son usage et tue la cible."""
+        witch.has_kill_potion = False
+        self._emit(EventType.POTION_USED, witch=witch.name, potion="kill", target=target_name)
+        return self._kill_player(target_name, DeathCause.POISON)
+
+    def _mark_dead(self, player, cause):
+        """Seul point de mort d'un joueur : met à jour le registre et journalise la mort."""
+        if self.registry.mark_dead(player):
+            self._emit(EventType.DEATH, player=player.name, cause=cause.label)
+
     def get_wolf_target(self):
         loups_ia = [p for p in self.players if p.role == Role.LOUP and not p.is_human and p.is_alive]
         proies_possibles = [p for p in self.players if p.role != Role.LOUP and p.is_alive]
@@ -151,10 +199,10 @@ class GameManager:
             # 2. Stratégie de "Bluff" : Ne pas voter systématiquement pour le même joueur 
             # que le joueur humain loup pour ne pas créer de groupe suspect
         if targets_high_priority:
-            return random.choice(targets_high_priority)
+            return self.rng.choice(targets_high_priority)
             
         # Comportement par défaut (Normal / Débutant)
-        return random.choice(proies_possibles)
+        return self.rng.choice(proies_possibles)
     
     def expert_ai_vote(self, player_ai):
         if player_ai.role == Role.LOUP:
@@ -165,23 +213,22 @@ class GameManager:
             # Il choisit la cible qui a déjà le plus de votes contre elle parmi les villageois
             return max(targets, key=lambda p: p.votes_received)
     
-        return random.choice(self.get_alive_players())
+        return self.rng.choice(self.get_alive_players())
 
         # VÉRIFIEZ QUE CETTE MÉTHODE EXISTE BIEN AVEC CE NOM EXACT
     def _setup_players(self, human_player_name):
         """Initialise la liste des joueurs (IA et Humain)."""
         num_ia = self.num_players_total - 1
         
-        # Mélange et sélection des noms d'IA
-        random.shuffle(IA_NAMES_POOL)
-        ia_names = IA_NAMES_POOL[:num_ia]
+        # Sélection aléatoire des noms d'IA (sans modifier la liste globale)
+        ia_names = self.rng.sample(IA_NAMES_POOL, num_ia)
         
         # 1. Créer le joueur humain
-        self.players.append(Player(human_player_name, is_human=True))
+        self.registry.add(Player(human_player_name, is_human=True))
         
         # 2. Créer les joueurs IA
         for name in ia_names:
-            self.players.append(self._create_player_instance(name, None, is_human=False))
+            self.registry.add(self._create_player_instance(name, None, is_human=False))
 
     
     # --- METHODES DE SETUP ET GETTERS ---
@@ -189,38 +236,18 @@ class GameManager:
 
     def _distribute_roles_after_human_choice(self, human_role, num_wolves_chosen):
         """Distribue les rôles en respectant le choix de l'utilisateur."""
-        
-        raw_roles = self._adjust_roles()
-        all_possible_roles = [Role(r) for r in raw_roles]
-
-        all_possible_roles = [r for r in all_possible_roles if r != Role.LOUP]
-       
-        if human_role in all_possible_roles:
-            all_possible_roles.remove(human_role)
-
-        roles_to_assign = []
-
-        # 4. On ajoute EXACTEMENT le nombre de loups choisi
-        wolves_to_add = num_wolves_chosen
-        if human_role == Role.LOUP:
-            wolves_to_add -= 1
-
-        for _ in range(max(0, wolves_to_add)):
-            roles_to_assign.append(Role.LOUP)
+        # Rôles des IA lus dans le catalogue précalculé (loups choisis + rôles restants)
+        roles_to_assign = list(composition_for_human(self.num_players_total, num_wolves_chosen, human_role))
     
-        slots_needed = (self.num_players_total - 1) - len(roles_to_assign)
-        roles_to_assign.extend(all_possible_roles[:slots_needed])
-
-        while len(roles_to_assign) < (self.num_players_total - 1):
-            roles_to_assign.append(Role.VILLAGEOIS)
-    
-        random.shuffle(roles_to_assign)
+        self.rng.shuffle(roles_to_assign)
         ai_players = [p for p in self.players if not p.is_human]
         for i, ai in enumerate(ai_players):
             ai.assign_role(roles_to_assign[i])
+            grant_role_powers(ai, roles_to_assign[i])
+        # Le rôle de l'humain a été attribué directement par l'interface : on réindexe tout
+        self.registry.reindex()
+        self._emit_roles()
     
-        self.wolves_alive = num_wolves_chosen
-
         
         if self.human_player.role and self.human_player.role.camp == Role.LOUP.camp:
             self.human_player.wolf_teammates = [
@@ -236,104 +263,46 @@ class GameManager:
             # Création du chemin de contexte unique pour chaque IA
             context_path = os.path.join("context", f"{name.replace(' ', '_').lower()}.txt") 
             
-            if not os.path.exists("context"):
-                os.makedirs("context")
+            # Seuls les agents qui lisent leur personnalité (LLM) ont besoin du fichier :
+            # les simulations (RandomAgent, tournois) n'écrivent rien dans context/
+            uses_file = getattr(self.agent_factory, "uses_personality_file", True)
+            if uses_file:
+                # exist_ok : plusieurs processus (tournoi) peuvent créer le dossier en même temps
+                os.makedirs("context", exist_ok=True)
                 
-            if not os.path.exists(context_path):
+            if uses_file and not os.path.exists(context_path):
                  with open(context_path, "w", encoding="utf-8") as f:
                     f.write(f"Tu es l'IA {name}. Ton rôle est d'être un joueur de Loup Garou. Réponds de manière concise.")
             
-            return ChatAgent(name, personality_context_path=context_path) 
-
+            agent = self.agent_factory(name, personality_context_path=context_path)
+            # Flux aléatoire propre à l'agent, dérivé de la graine de la partie (votes en parallèle)
+            agent.rng = SeededRandom(self.rng.getrandbits(64))
+            return agent
 
-    def _adjust_roles(self):
-        """Ajuste la liste des rôles pour 6-15 joueurs avec min 2 loups et 4 villageois."""
-        # 1. On commence par les deux loups obligatoires
-        roles_list = [Role.LOUP, Role.LOUP]
-    
-        # 2. On définit les rôles spéciaux disponibles (priorité)
-        # On en choisit certains selon le nombre de joueurs pour ne pas dépasser le total
-        special_roles_pool = [
-            Role.VOYANTE, Role.SORCIERE, Role.CHASSEUR, 
-            Role.CUPIDON, Role.MAIRE, Role.SALVATEUR, Role.ANCIEN
-        ]
-    
-        # Si on a plus de 10 joueurs, on peut ajouter un 3ème loup
-        if self.num_players_total >= 11:
-            roles_list.append(Role.LOUP)
-
-        # 3. Calculer combien de places il reste pour atteindre le total
-        remaining_slots = self.num_players_total - len(roles_list)
-    
-        # 4. Remplir avec les rôles spéciaux jusqu'à ce qu'il ne reste que 4 places (pour les villageois obligatoires)
-        # Ou jusqu'à épuisement du pool de rôles spéciaux.
-        current_specials = 0
-        while remaining_slots > 4 and current_specials < len(special_roles_pool):
-            roles_list.append(special_roles_pool[current_specials])
-            remaining_slots -= 1
-            current_specials += 1
-        
-        # 5. Le reste est obligatoirement des Villageois simples (minimum 4 garanti par la boucle ci-dessus)
-        for _ in range(remaining_slots):
-            roles_list.append(Role.VILLAGEOIS)
-        
-        return [r.value for r in roles_list]
-        
-    def _generate_roles(self, total_players):
-        """Génère une liste de rôles équilibrée pour la partie."""
-        roles = []
-        
-        # 1. Ajout des Loups (environ 1/4 ou 1/3 des joueurs)
-        num_wolves = 3 if total_players >= 10 else 2
-        for _ in range(num_wolves):
-            roles.append(Role.LOUP)
-            
-        # 2. Ajout des rôles spéciaux indispensables
-        mandatory_roles = [
-            Role.VOYANTE, 
-            Role.SORCIERE, 
-            Role.CHASSEUR, 
-            Role.CUPIDON, 
-            Role.SALVATEUR,
-            Role.ANCIEN
-        ]
-        
-        for r in mandatory_roles:
-            if len(roles) < total_players:
-                roles.append(r)
-                
-        # 3. Remplir le reste avec des Villageois simples si nécessaire
-        while len(roles) < total_players:
-            roles.append(Role.VILLAGEOIS)
-            
-        return roles
 
     def _distribute_roles(self):
         """Distribue aléatoirement les rôles aux joueurs et informe les Loups."""
-        roles_to_distribute = [Role(r) for r in self.available_roles] 
+        roles_to_distribute = list(self.available_roles)
         if len(self.players) != len(roles_to_distribute):
              raise ValueError("Le nombre de joueurs doit correspondre au nombre de rôles disponibles.")
 
-        random.shuffle(roles_to_distribute)
+        self.rng.shuffle(roles_to_distribute)
 
         # 1. Distribution initiale et ajout du rôle au contexte de chaque IA
         for player in self.players:
             role = roles_to_distribute.pop()
-            player.assign_role(role)
+            self.registry.set_role(player, role)
             
-            # Initialisation des capacités/potions
-            if role == Role.SORCIERE:
-                player.has_kill_potion = True
-                player.has_life_potion = True
-            elif role == Role.CHASSEUR:
-                player.has_hunter_shot = True
+            grant_role_powers(player, role)
             
             if not player.is_human:
-                player.history.append({
-                    "role": "system",
-                    "content": f"TON RÔLE ACTUEL DANS LA PARTIE EST: {role.name}. Tu es dans le camp des {role.camp.value}."
-                })
+                self._add_private_note(
+                    player,
+                    f"TON RÔLE ACTUEL DANS LA PARTIE EST: {role.name}. Tu es dans le camp des {role.camp.value}."
+                )
         
+        self._emit_roles()
+
         # --- LOGIQUE : INFORMER TOUS LES LOUPS ---
         all_wolves = [p for p in self.players if p.role.camp == Camp.LOUP]
         all_wolf_names = [p.name for p in all_wolves]
@@ -344,29 +313,38 @@ class GameManager:
             if not p.is_human:
                 if co_wolves: 
                     wolf_list_str = ", ".join(co_wolves)
-                    p.history.append({
-                        "role": "system",
-                        "content": f"TES COÉQUIPIERS LOUPS-GAROUS SONT : {wolf_list_str}. Ne les trahis jamais. Travaillez ensemble pour tuer les villageois."
-                    })
+                    self._add_private_note(
+                        p,
+                        f"TES COÉQUIPIERS LOUPS-GAROUS SONT : {wolf_list_str}. Ne les trahis jamais. Travaillez ensemble pour tuer les villageois."
+                    )
             
             else: 
                  p.wolf_teammates = co_wolves 
         
-    def _recalculate_wolf_count(self):
-        """Recalcule le nombre de loups vivants et met à jour l'attribut."""
-        self.wolves_alive = sum(1 for p in self.players if p.role.camp == Camp.LOUP and p.is_alive)
+    def start_new_day(self):
+        """Passe au jour suivant et en informe la mémoire des IA."""
+        self.day += 1
+        self._emit(EventType.DAY_STARTED)
+        for p in self.players:
+            if not p.is_human:
+                p.on_new_day(self.day)
+
+    @property
+    def wolves_alive(self):
+        """Nombre de loups vivants (compteur tenu à jour par le registre)."""
+        return self.registry.alive_in_camp(Camp.LOUP)
             
     def get_alive_players(self):
-        """Retourne la liste des joueurs vivants."""
-        return [p for p in self.players if p.is_alive]
+        """Retourne la liste des joueurs vivants (dans l'ordre de la table)."""
+        return self.registry.alive()
         
     def get_player_by_name(self, name):
         """Retourne un joueur par son nom."""
-        return next((p for p in self.players if p.name == name), None)
+        return self.registry.get(name)
         
     def get_player_by_role(self, role_enum):
         """Retourne le joueur ayant ce rôle (le premier trouvé)."""
-        return next((p for p in self.players if p.role == role_enum), None)
+        return self.registry.first_with_role(role_enum)
 
     def _get_public_status(self):
         """Retourne l'état public des joueurs pour le prompt des IA."""
@@ -374,28 +352,26 @@ class GameManager:
 
     def check_win_condition(self):
         """
-        Vérifie les conditions de victoire.
+        Vérifie les conditions de victoire (en temps constant, via les compteurs du registre).
         - Villageois gagnent si tous les loups sont morts.
         - Loups gagnent si leur nombre est supérieur ou égal au nombre de villageois.
         """
-        alive_players = self.get_alive_players() #
-    
-        # Compter les survivants par camp
-        wolves = [p for p in alive_players if p.role.camp == Camp.LOUP] #
-        villagers = [p for p in alive_players if p.role.camp == Camp.VILLAGE] #
-    
-        num_wolves = len(wolves) #
-        num_villagers = len(villagers) #
+        num_wolves = self.registry.alive_in_camp(Camp.LOUP)
+        num_villagers = self.registry.alive_in_camp(Camp.VILLAGE)
 
+        winner = None
         # Condition 1 : Plus aucun loup
-        if num_wolves == 0: #
-            return Camp.VILLAGE #
+        if num_wolves == 0:
+            winner = Camp.VILLAGE
 
         # Condition 2 : Autant de loups que de villageois (ou plus)
-        if num_wolves >= num_villagers: #
-            return Camp.LOUP #
+        elif num_wolves >= num_villagers:
+            winner = Camp.LOUP
 
-        return None
+        if winner and not self._winner_announced:
+            self._winner_announced = True
+            self._emit(EventType.GAME_OVER, winner=winner.value)
+        return winner
     
     def shuffle_all_roles(self):
         """Redistribue les rôles actuels entre tous les joueurs vivants."""
@@ -403,10 +379,11 @@ class GameManager:
     
     
         current_roles = [p.role for p in alive_players]
-        random.shuffle(current_roles)
+        self.rng.shuffle(current_roles)
     
         for i, player in enumerate(alive_players):
-            player.assign_role(current_roles[i])
+            self.registry.set_role(player, current_roles[i])
+            self._emit(EventType.ROLE_DEALT, player=player.name, role=role_key(player.role), initial=False)
         
         if self.human_player.is_alive:
             if self.human_player.role.camp == Camp.LOUP:
@@ -418,60 +395,70 @@ class GameManager:
                 self.human_player.wolf_teammates = []
         
     # --- Logique de Mort Centralisée ---
-    def _kill_player(self, target_player_name, reason="tué par les Loups"):
+    def _resolve_deaths(self, target_player_name, cause=DeathCause.WOLVES):
+        """
+        Résout une mort et toutes ses conséquences (tir du Chasseur, chagrin de l'amoureux)
+        sans récursion : les morts en attente sont empilées puis traitées une à une, dans
+        le même ordre que les règles (la victime du Chasseur avant l'amoureux).
+        Retourne la liste des DeathOutcome, dans l'ordre de résolution.
+        """
+        outcomes = []
+        pending = [(target_player_name, cause, None)]
+        while pending:
+            name, cause, source = pending.pop()
+            target = self.registry.get(name)
+            if not target or not target.is_alive:
+                continue
+
+            # L'Ancien survit à la première attaque des Loups (son totem est consommé)
+            if target.role == Role.ANCIEN and target.is_ancient_protected and cause.blocked_by_ancient_shield:
+                target.is_ancient_protected = False
+                self.ancient_shield_triggered = True
+                self._emit(EventType.ANCIENT_SHIELD, player=target.name)
+                outcomes.append(DeathOutcome(target.name, target.role, cause, source, True))
+                continue
+
+            self._mark_dead(target, cause)
+            outcomes.append(DeathOutcome(target.name, target.role, cause, source, False))
+
+            # Empilé en premier : l'amoureux meurt après toute la chaîne du Chasseur
+            if self.lovers and name in self.lovers:
+                partner_name = self.lovers[0] if name == self.lovers[1] else self.lovers[1]
+                if self.registry.is_alive(partner_name):
+                    pending.append((partner_name, DeathCause.HEARTBREAK, name))
+
+            if target.role == Role.CHASSEUR and target.has_hunter_shot:
+                survivors = self.get_alive_players()
+                if survivors:
+                    self.hunter_just_shot = True
+                    target.has_hunter_shot = False
+                    shot = self.rng.choice(survivors)
+                    self._emit(EventType.HUNTER_SHOT, hunter=target.name, target=shot.name)
+                    pending.append((shot.name, DeathCause.HUNTER, target.name))
+        return outcomes
+
+    def _format_death(self, outcome):
+        """Message du journal de jeu pour une issue de _resolve_deaths."""
+        if outcome.survived:
+            return "🌟 **L'ANCIEN** a été attaqué, mais son totem de protection lui a sauvé la vie cette fois ! Il est désormais vulnérable."
+        if outcome.cause == DeathCause.HUNTER:
+            return f"🏹 CHASSEUR ACTIF : {outcome.source} emporte {outcome.player} (Rôle: {outcome.role.name}) dans sa chute !"
+        if outcome.cause == DeathCause.HEARTBREAK:
+            return f"💖 COUPLE CASSÉ : Suite à la mort de {outcome.source}, {outcome.player} est mort(e) de chagrin."
+        return f"❌ {outcome.player} est mort(e) ({outcome.cause.label}). Rôle: {outcome.role.name}."
+
+    def _kill_player(self, target_player_name, reason=DeathCause.WOLVES):
         """
         Tue un joueur et gère l'effet de mort en chaîne du Chasseur et du Cupidon.
-        Retourne le message de mort complet.
+        `reason` est une DeathCause (ou son libellé). Les issues sont conservées dans
+        `last_death_outcomes`. Retourne le message de mort complet.
         """
-        
-        target = self.get_player_by_name(target_player_name)
-        if not target or not target.is_alive:
+        cause = reason if isinstance(reason, DeathCause) else DeathCause(reason)
+        outcomes = self._resolve_deaths(target_player_name, cause)
+        self.last_death_outcomes = outcomes
+        if not outcomes:
             return f"{target_player_name} n'a pas pu être tué."
-            
-        target.is_alive = False
-        message = f"❌ {target.name} est mort(e) ({reason}). Rôle: {target.role.name}."
-        
-        hunter_eliminated_target = None
-
-        if target.role == Role.ANCIEN and target.is_ancient_protected and "lynché" not in reason:
-            self.ancient_shield_triggered = True
-            target.is_ancient_protected = False
-            
-            return f"🌟 **L'ANCIEN** a été attaqué, mais son totem de protection lui a sauvé la vie cette fois ! Il est désormais vulnérable."
-        
-        # S'il survit, on sort de la fonction sans le tuer ni activer les effets de mort.
-        if target.role == Role.ANCIEN and not target.is_ancient_protected and "lynché" not in reason:
-            # S'il a déjà utilisé son jeton, il meurt normalement et active les effets.
-            pass
-
-        target.is_alive = False
-        message = f"❌ {target.name} est mort(e) ({reason}). Rôle: {target.role.name}."
-        
-        # 1. LOGIQUE DU CHASSEUR
-        if target.role == Role.CHASSEUR and target.has_hunter_shot:
-            survivors = [p for p in self.get_alive_players() if p.name != target.name] 
-            
-            if survivors:
-                self.hunter_just_shot = True
-                hunter_eliminated_target = random.choice(survivors)
-                # Utilisation de _kill_player pour gérer la mort en chaîne
-                self._kill_player(hunter_eliminated_target.name, reason="emporté(e) par le Chasseur")
-                target.has_hunter_shot = False 
-                message += f"\n🏹 CHASSEUR ACTIF : Il emporte {hunter_eliminated_target.name} (Rôle: {hunter_eliminated_target.role.name}) dans sa chute !"
-        
-        # 2. LOGIQUE DU CUPIDON (Mort en chaîne)
-        if self.lovers and target_player_name in self.lovers:
-            # Trouver le partenaire
-            partner_name = self.lovers[0] if target_player_name == self.lovers[1] else self.lovers[1]
-            partner = self.get_player_by_name(partner_name)
-            
-            if partner and partner.is_alive:
-                # Appel récursif pour tuer le partenaire
-                self._kill_player(partner_name, reason="mort de chagrin d'amour")
-                message += f"\n💖 COUPLE CASSÉ : Suite à la mort de {target.name}, {partner_name} est mort(e) de chagrin."
-        
-        self._recalculate_wolf_count()
-        return message
+        return "\n".join(self._format_death(outcome) for outcome in outcomes)
 
     # --- Phase d'Action Cupidon ---
     def _handle_cupid_phase(self, human_choice=None):
@@ -490,15 +477,17 @@ class GameManager:
             target1_name, target2_name = human_choice.split(',')
             self.lovers = (target1_name.strip(), target2_name.strip())
             self.is_cupid_phase_done = True
+            self._emit(EventType.LOVERS_BOUND, lovers=list(self.lovers))
             return f"💖 {cupidon.name} a lié {self.lovers[0]} et {self.lovers[1]}."
         
         # Logique IA
         elif not cupidon.is_human:
             potential_targets = [p.name for p in self.players] 
             if len(potential_targets) >= 2:
-                love_targets = random.sample(potential_targets, 2)
+                love_targets = self.rng.sample(potential_targets, 2)
                 self.lovers = (love_targets[0], love_targets[1])
                 self.is_cupid_phase_done = True
+                self._emit(EventType.LOVERS_BOUND, lovers=list(self.lovers))
                 return f"💖 Cupidon (IA) a lié {self.lovers[0]} et {self.lovers[1]}."
             
         return "Action Cupidon en attente ou erreur de sélection."
@@ -507,18 +496,49 @@ class GameManager:
 
     # --- Phase de Nuit ---
 
-    def _night_phase(self):
-        """Orchestre les actions secrètes des joueurs."""
-        from collections import defaultdict
-        import random
-
+    def _ask_night_action(self, player, alive, deadline=None, should_stop=None):
+        """
+        Demande sa cible de nuit à une IA. Avec une échéance (time.monotonic()), l'appel est borné
+        par NIGHT_ACTION_TIMEOUT et par le temps restant (et abandonné dès que should_stop() répond vrai) ;
+        hors délai ou en erreur, une cible valide est tirée au hasard, comme pour un vote hors délai.
+        """
+        if deadline is None:
+            return player.decide_night_action(alive)
+
+        # Même exécution que les votes (decision_runner) : thread démon, et une décision abandonnée
+        # n'écrit jamais dans l'historique de l'agent
+        [(answered, target)] = run_decisions(
+            [(player.decide_night_action, (alive,))],
+            timeout=self.NIGHT_ACTION_TIMEOUT,
+            max_workers=1,
+            deadline=deadline,
+            should_stop=should_stop,
+            name="night",
+        )
+        if answered:
+            return target
+
+        print(f"Action de nuit de {player.name} hors délai ou en erreur : cible aléatoire.")
+        targets = [p.name for p in alive if p.name != player.name]
+        if player.role.camp == Camp.LOUP:
+            targets = [p.name for p in alive if p.role.camp != Camp.LOUP] or targets
+        return self.rng.choice(targets) if targets else None
+
+    def _night_phase(self, on_action=None, deadline=None, should_stop=None):
+        """
+        Orchestre les actions secrètes des joueurs.
+        - on_action(role) est appelé quand un rôle commence son action (Voyante, Salvateur, Loups, Sorcière) ;
+        - deadline borne le temps des décisions IA (décision de secours au-delà, voir _ask_night_action) ;
+        - should_stop() est consulté entre deux actions : s'il répond vrai, la nuit s'arrête et retourne None.
+        """
         alive = self.get_alive_players()
         night_messages = []
+        notify = on_action or (lambda role: None)
+        stopped = should_stop or (lambda: False)
     
         # 1. NUIT BLANCHE (aucune mort ou action spéciale la Nuit 1)
         if self.day == 1:
             night_messages.append("🌙 Première nuit passée. Le village se réveille sans drame !")
-            self._recalculate_wolf_count()
             return "\n".join(night_messages)
             # --- LOGIQUE POUR NUIT 2 et suivantes ---
         actions_by_priority = defaultdict(list)
@@ -533,19 +553,25 @@ class GameManager:
     
         for priority in sorted_priorities:
             for player in actions_by_priority[priority]:
+                if stopped():
+                    return None
             
                 # A. Logique VOYANTE
                 if player.role.night_action == NightAction.INVESTIGATE and not player.is_human:
-                    target_name = player.decide_night_action(alive)
+                    notify(Role.VOYANTE)
+                    target_name = self._ask_night_action(player, alive, deadline, should_stop)
                     target = self.get_player_by_name(target_name)
                     if target:
-                        player.history.append({
-                            "role": "system", 
-                            "content": f"Tu as vu que {target.name} est un(e) {target.role.name} ({target.role.camp.value})."
-                        })
+                        self._emit(EventType.SEER_VISION, seer=player.name, target=target.name,
+                                   role=role_key(target.role))
+                        self._add_private_note(
+                            player,
+                            f"Tu as vu que {target.name} est un(e) {target.role.name} ({target.role.camp.value})."
+                        )
             
                 # B. Logique SALVATEUR
                 elif player.role.night_action == NightAction.PROTECT:
+                    notify(Role.SALVATEUR)
                     target_name = None
                 
                     if player.is_human:
@@ -555,13 +581,14 @@ class GameManager:
                         last_protected = getattr(player, 'last_protected_target', None)
                         targets_available = [p.name for p in alive if p.name != last_protected]
                         if targets_available:
-                            target_name = random.choice(targets_available)
+                            target_name = self.rng.choice(targets_available)
 
                     # Validation et application de la protection
                     if target_name:
                         if target_name != getattr(player, 'last_protected_target', None):
                             self.night_protected_target = target_name
                             player.last_protected_target = target_name
+                            self._emit(EventType.PROTECTION, protector=player.name, target=target_name)
                         else:
                             # Si l'humain a triché ou erreur : pas de protection cette nuit
                             pass
@@ -569,29 +596,35 @@ class GameManager:
                 # C. Logique LOUPS
                 elif player.role.night_action == NightAction.KILL and player.role.camp == Camp.LOUP:
                     if not self.night_kill_target:
+                        notify(Role.LOUP)
                         if not player.is_human:
-                            t_name = player.decide_night_action(alive)
+                            t_name = self._ask_night_action(player, alive, deadline, should_stop)
                         else:
                             # Loup humain
                             t_name = getattr(self, 'human_choice', None)
                         self.night_kill_target = self.get_player_by_name(t_name)
 
         # 3. Résolution du Meurtre des Loups
+        if stopped():
+            return None
         kill_target = self.night_kill_target
         if kill_target:
             # Vérification Protection SALVATEUR
             if kill_target.name == self.night_protected_target:
+                self._emit(EventType.KILL_ATTEMPT, target=kill_target.name, saved_by="Salvateur")
                 night_messages.append(f"🛡️ **{kill_target.name}** a été attaqué(e) mais **sauvé(e) par le Salvateur** !")
                 kill_target = None # On annule la mort
             else:
                 # Logique SORCIERE
                 sorciere = self.get_player_by_role(Role.SORCIERE)
                 if sorciere and sorciere.is_alive:
+                    notify(Role.SORCIERE)
                     # Sorcière IA
                     if not sorciere.is_human and getattr(sorciere, 'has_life_potion', False):
-                        if kill_target.role.camp != Camp.LOUP and random.random() < 0.5:
+                        if kill_target.role.camp != Camp.LOUP and self.rng.random() < 0.5:
                             is_saved_by_witch = True
                             sorciere.has_life_potion = False 
+                            self._emit(EventType.POTION_USED, witch=sorciere.name, potion="life", target=kill_target.name)
                             night_messages.append(f"✅ {kill_target.name} a été sauvé(e) par la Sorcière !")
                 
                     # Sorcière Humaine (vérification du choix 'SAUVER')
@@ -599,23 +632,18 @@ class GameManager:
                         if getattr(sorciere, 'has_life_potion', False):
                             is_saved_by_witch = True
                             sorciere.has_life_potion = False
+                            self._emit(EventType.POTION_USED, witch=sorciere.name, potion="life", target=kill_target.name)
                             night_messages.append(f"✅ Vous avez utilisé votre potion pour sauver {kill_target.name} !")
+                self._emit(EventType.KILL_ATTEMPT, target=kill_target.name,
+                           saved_by="Sorcière" if is_saved_by_witch else None)
                 # Exécution finale de la mort si non sauvé
                 if not is_saved_by_witch:
-                    message_mort = self._kill_player(kill_target.name, reason="tué par les Loups")
+                    message_mort = self._kill_player(kill_target.name, DeathCause.WOLVES)
                     night_messages.append(message_mort)
                     self.last_death_was_by_wolf = True
                 else:
                     self.last_death_was_by_wolf = False
 
-        if self.night_kill_target:
-            victim = self.get_player_by_name(self.night_kill_target)
-            if victim:
-                victim.is_alive = False
-                # On réinitialise pour la nuit suivante
-                self.night_kill_target = None
-
-        self._recalculate_wolf_count()
         # On réinitialise les choix humains pour la nuit suivante
         self.human_choice = None
         self.human_action_type = None
@@ -639,22 +667,89 @@ class GameManager:
         """Enregistre le vote du joueur humain pour le lynchage."""
         if self.human_player.is_alive:
             self.vote_counts[voted_player_name] += 1
+            self._emit(EventType.VOTE_CAST, voter=self.human_player.name, target=voted_player_name)
         
         self._voting_phase_ia_only() 
 
     def _voting_phase_ia_only(self):
         """Collecte les votes des IA (déclenché par la fin du débat ou par le vote humain)."""
         alive_players = self.get_alive_players()
-        
-        for voter in alive_players:
-            if not voter.is_human and voter.is_alive:
-                voted_name = voter.decide_vote(self._get_public_status(), debate_summary="Récapitulatif des accusations...")
-                
-                if voted_name and voted_name in [p.name for p in alive_players]:
-                     self.vote_counts[voted_name] += 1
+        voters = [p for p in alive_players if not p.is_human]
+        public_status = self._get_public_status()
+
+        if self.BATCHED_VOTES and self._can_batch_votes(voters):
+            ballots = self._collect_votes_batched(voters, public_status)
+        elif (self.BATCHED_VOTES or self.CONCURRENT_VOTES) and len(voters) > 1:
+            ballots = self._collect_votes_concurrently(voters, public_status)
+        else:
+            ballots = [self._ask_vote(voter, public_status) for voter in voters]
+
+        # Dépouillement dans l'ordre des joueurs : le résultat ne dépend pas de l'ordre d'arrivée des réponses
+        for voter, voted_name in zip(voters, ballots):
+            if voted_name and self.registry.is_alive(voted_name):
+                self.vote_counts[voted_name] += 1
+                self._emit(EventType.VOTE_CAST, voter=voter.name, target=voted_name)
+
+    @staticmethod
+    def _can_batch_votes(voters):
+        """Vrai si un seul appel groupé peut servir tous les votants : des ChatAgent branchés sur le même backend."""
+        if len(voters) < 2 or not hasattr(ChatAgent, "decide_votes_batched"):
+            return False
+        backend = getattr(voters[0], "backend", None)
+        return all(isinstance(voter, ChatAgent) and voter.backend is backend for voter in voters)
+
+    def _ask_vote(self, voter, public_status):
+        """Demande son bulletin à une IA."""
+        return voter.decide_vote(public_status, debate_summary="Récapitulatif des accusations...")
+
+    def _collect_votes_concurrently(self, voters, public_status):
+        """
+        Interroge toutes les IA en parallèle (au plus VOTE_MAX_WORKERS appels simultanés).
+        Chaque appel dispose de VOTE_TIMEOUT secondes à partir de son démarrage ; un appel hors délai
+        est abandonné (sa place revient au votant suivant, sa réponse tardive n'écrit rien dans
+        l'historique). Retourne les bulletins dans l'ordre des votants ; un bulletin hors délai ou en
+        erreur est remplacé par un vote aléatoire, comme lorsque le LLM répond un nom invalide.
+        """
+        results = run_decisions(
+            [(self._ask_vote, (voter, public_status)) for voter in voters],
+            timeout=self.VOTE_TIMEOUT,
+            max_workers=max(1, self.VOTE_MAX_WORKERS),
+            name="vote"
+        )
+
+        ballots = []
+        for voter, (answered, voted_name) in zip(voters, results):
+            if not answered:
+                print(f"Vote de {voter.name} hors délai ou en erreur : vote aléatoire.")
+                voted_name = self._fallback_vote(voter, public_status)
+            ballots.append(voted_name)
+        return ballots
+
+    def _collect_votes_batched(self, voters, public_status):
+        """
+        Vote groupé (ChatAgent.decide_votes_batched) borné par VOTE_TIMEOUT, comme un bulletin isolé :
+        il peut être appelé depuis le thread de rendu (vote humain), qui ne doit jamais rester bloqué.
+        Hors délai ou en erreur, chaque votant reçoit un vote aléatoire ; la réponse tardive n'écrit rien.
+        """
+        [(answered, ballots)] = run_decisions(
+            [(ChatAgent.decide_votes_batched, (voters, public_status))],
+            timeout=self.VOTE_TIMEOUT,
+            max_workers=1,
+            name="vote"
+        )
+        if answered:
+            return ballots
+        print("Vote groupé hors délai ou en erreur : votes aléatoires.")
+        return [self._fallback_vote(voter, public_status) for voter in voters]
+
+    def _fallback_vote(self, voter, public_status):
+        """Bulletin de secours : un autre joueur vivant, tiré avec le générateur de la partie."""
+        targets = [p['name'] for p in public_status if p['is_alive'] and p['name'] != voter.name]
+        return self.rng.choice(targets) if targets else None
 
     def _lynch_result(self, alive_players):
         if not self.vote_counts:
+            self._emit(EventType.LYNCH, target=None, votes={})
             return "Le village n'a pas réussi à se mettre d'accord. Personne n'est lynché."
 
         # LOGIQUE MAIRE
@@ -686,11 +781,13 @@ class GameManager:
         max_votes = self.vote_counts[lynch_target_name]
         
         if list(self.vote_counts.values()).count(max_votes) > 1:
+            self._emit(EventType.LYNCH, target=None, votes=dict(self.vote_counts))
             self.vote_counts.clear()
             return f"⚖️ Égalité des votes ! Personne n'est lynché (Max votes: {max_votes}). {mayor_message}"
             
+        self._emit(EventType.LYNCH, target=lynch_target_name, votes=dict(self.vote_counts))
         # Élimination via la méthode centralisée
-        message = self._kill_player(lynch_target_name, reason="lynché(e) par le village")
+        message = self._kill_player(lynch_target_name, DeathCause.LYNCH)
         
         self.vote_counts.clear()
         # On ajoute le message du Maire au début du résultat du lynchage
@@ -0,0 +1,228 @@
+# game_events.py
+
+import json
+import threading
+from enum import Enum
+from collections import defaultdict, deque
+
+from enums_and_roles import Camp, Role
+from player_state import Player, grant_role_powers
+from player_registry import PlayerRegistry
+
+
+class EventType(Enum):
+    GAME_STARTED = "game_started"      # seed, players [{name, is_human}]
+    ROLE_DEALT = "role_dealt"          # player, role, initial (False : échange des rôles en cours de partie)
+    DAY_STARTED = "day_started"
+    LOVERS_BOUND = "lovers_bound"      # lovers [name1, name2]
+    SEER_VISION = "seer_vision"        # seer, target, role
+    PROTECTION = "protection"          # protector, target
+    KILL_ATTEMPT = "kill_attempt"      # target, saved_by (None, "Salvateur", "Sorcière")
+    POTION_USED = "potion_used"        # witch, potion ("life" ou "kill"), target
+    ANCIENT_SHIELD = "ancient_shield"  # player
+    HUNTER_SHOT = "hunter_shot"        # hunter, target
+    DEATH = "death"                    # player, cause
+    VOTE_CAST = "vote_cast"            # voter, target
+    LYNCH = "lynch"                    # target (None en cas d'égalité), votes
+    GAME_OVER = "game_over"            # winner
+
+
+# Fin de phase : le tampon est écrit sur disque (reprise après un crash au pire à la phase près)
+FLUSH_EVENTS = {EventType.DAY_STARTED, EventType.LYNCH, EventType.GAME_OVER}
+
+
+def role_key(role):
+    """Identifiant stable d'un rôle dans le journal ("LOUP", "SORCIERE"...)."""
+    return role._name_ if role is not None else None
+
+
+class JsonlEventSink:
+    """
+    Écrit les événements, en ajout seul, dans un fichier JSONL (un objet JSON par ligne).
+    Les lignes sont mises en tampon et écrites par blocs de `buffer_size`, ou à chaque fin de phase.
+    """
+
+    def __init__(self, path, buffer_size=64):
+        self.path = path
+        self.buffer_size = buffer_size
+        self._buffer = []
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, event):
+        if self._file is None:
+            return  # Sink fermé (partie remplacée) : les événements tardifs sont ignorés
+        self._buffer.append(json.dumps(event, ensure_ascii=False))
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer and self._file:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._file.flush()
+            self._buffer = []
+
+    def close(self):
+        self.flush()
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+class EventLog:
+    """
+    Journal des événements d'une partie : numérotés, conservés en mémoire et transmis au sink.
+    La copie en mémoire peut être désactivée (keep_in_memory) ou bornée aux `max_in_memory`
+    derniers événements. `owns_sink` : le sink a été ouvert pour cette partie et close() le ferme.
+    """
+
+    def __init__(self, sink=None, keep_in_memory=True, max_in_memory=None, owns_sink=False):
+        self.sink = sink
+        self.keep_in_memory = keep_in_memory
+        self.owns_sink = owns_sink
+        self.events = deque(maxlen=max_in_memory)
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def emit(self, event_type, day, **data):
+        with self._lock:
+            self._seq += 1
+            event = {"seq": self._seq, "type": event_type.value, "day": day, **data}
+            if self.keep_in_memory:
+                self.events.append(event)
+            if self.sink:
+                self.sink.write(event)
+                if event_type in FLUSH_EVENTS:
+                    self.sink.flush()
+        return event
+
+    def flush(self):
+        if self.sink:
+            with self._lock:
+                self.sink.flush()
+
+    def close(self):
+        """Vide le sink et le ferme s'il appartient à cette partie (un sink fourni reste ouvert)."""
+        if self.sink:
+            with self._lock:
+                if self.owns_sink:
+                    self.sink.close()
+                else:
+                    self.sink.flush()
+
+
+def read_events(path):
+    """Lit un journal JSONL et le découpe en parties (une liste d'événements par GAME_STARTED)."""
+    games = []
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            event = json.loads(line)
+            if event["type"] == EventType.GAME_STARTED.value or not games:
+                games.append([])
+            games[-1].append(event)
+    return games
+
+
+class GameReplayer:
+    """
+    Reconstruit l'état d'une partie à partir de son journal : joueurs (rôles, vie, pouvoirs
+    consommés), amoureux, jour courant, votes par jour, morts et vainqueur.
+    """
+
+    def __init__(self):
+        self.seed = None
+        self.day = 0
+        self.registry = PlayerRegistry()
+        self.lovers = None
+        self.votes = defaultdict(dict)  # jour -> {votant: cible}
+        self.lynches = []               # (jour, cible ou None)
+        self.deaths = []                # (jour, joueur, cause)
+        self.winner = None
+
+    @classmethod
+    def from_events(cls, events):
+        replayer = cls()
+        for event in events:
+            replayer.apply(event)
+        return replayer
+
+    @classmethod
+    def from_file(cls, path, game_index=-1):
+        """Rejoue une partie du fichier (la dernière par défaut)."""
+        return cls.from_events(read_events(path)[game_index])
+
+    def apply(self, event):
+        kind = EventType(event["type"])
+        self.day = event.get("day", self.day)
+        handler = getattr(self, "_on_" + kind.value, None)
+        if handler:
+            handler(event)
+
+    def _player(self, name):
+        return self.registry.get(name)
+
+    def _on_game_started(self, event):
+        self.seed = event.get("seed")
+        for entry in event["players"]:
+            self.registry.add(Player(entry["name"], is_human=entry["is_human"]))
+
+    def _on_role_dealt(self, event):
+        player = self._player(event["player"])
+        if player:
+            role = Role[event["role"]]
+            self.registry.set_role(player, role)
+            # Distribution initiale (journaux anciens : sans indicateur) : capacités du rôle accordées
+            if event.get("initial", True):
+                grant_role_powers(player, role)
+
+    def _on_lovers_bound(self, event):
+        self.lovers = list(event["lovers"])
+        for name in self.lovers:
+            player = self._player(name)
+            if player:
+                player.is_in_love = True
+
+    def _on_protection(self, event):
+        protector = self._player(event["protector"])
+        if protector:
+            protector.last_protected_target = event["target"]
+
+    def _on_kill_attempt(self, event):
+        if event.get("saved_by") == "Sorcière":
+            witch = self.registry.first_with_role(Role.SORCIERE)
+            if witch:
+                witch.has_life_potion = False
+
+    def _on_potion_used(self, event):
+        witch = self._player(event["witch"])
+        if witch:
+            if event["potion"] == "kill":
+                witch.has_kill_potion = False
+            else:
+                witch.has_life_potion = False
+
+    def _on_ancient_shield(self, event):
+        player = self._player(event["player"])
+        if player:
+            player.is_ancient_protected = False
+
+    def _on_hunter_shot(self, event):
+        hunter = self._player(event["hunter"])
+        if hunter:
+            hunter.has_hunter_shot = False
+
+    def _on_death(self, event):
+        player = self._player(event["player"])
+        if player:
+            self.registry.mark_dead(player)
+        self.deaths.append((self.day, event["player"], event.get("cause")))
+
+    def _on_vote_cast(self, event):
+        self.votes[self.day][event["voter"]] = event["target"]
+
+    def _on_lynch(self, event):
+        self.lynches.append((self.day, event.get("target")))
+
+    def _on_game_over(self, event):
+        self.winner = Camp(event["winner"])
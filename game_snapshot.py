@@ -0,0 +1,242 @@
+# game_snapshot.py
+
+import json
+import zlib
+import random
+import importlib
+import threading
+from collections import defaultdict
+
+from enums_and_roles import Role
+from game_core import GameManager
+from game_events import EventLog, role_key
+from llm_backends import backend_kind, shared_backend
+from player_registry import PlayerRegistry
+from player_state import Player
+from seeded_random import SeededRandom
+
+
+MAGIC = b"LGS1"  # En-tête des sauvegardes (format + version)
+
+# Champs de Player sauvegardés tels quels (le rôle et le flux aléatoire sont traités à part)
+PLAYER_FIELDS = [name for name in Player.__slots__ if name not in ("role", "rng")]
+
+
+def _rng_state(rng):
+    if rng is None:
+        return None
+    if isinstance(rng, SeededRandom):
+        return rng.state()  # [graine, mots consommés] : quelques octets au lieu de 625 mots
+    version, internal, gauss = rng.getstate()
+    return [version, list(internal), gauss]
+
+
+def _restore_rng(state):
+    if state is None:
+        return None
+    if len(state) == 2:
+        return SeededRandom.from_state(state)
+    rng = random.Random()
+    version, internal, gauss = state
+    rng.setstate((version, tuple(internal), gauss))
+    return rng
+
+
+def _class_path(obj):
+    cls = type(obj)
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _load_class(path):
+    module_name, qualname = path.split(":")
+    obj = importlib.import_module(module_name)
+    for part in qualname.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+# --- Capture ---
+
+def _player_state(player):
+    state = {field: getattr(player, field) for field in PLAYER_FIELDS}
+    state["wolf_teammates"] = list(player.wolf_teammates)
+    state["role"] = role_key(player.role)
+    state["rng"] = _rng_state(player.rng)
+    state["class"] = _class_path(player)
+
+    # Mémoire des agents IA (ChatAgent) : historique, résumé glissant, fichier de personnalité
+    if hasattr(player, "history_snapshot"):
+        state["history"] = player.history_snapshot()
+    elif hasattr(player, "history"):
+        state["history"] = player.history
+    memory = getattr(player, "memory", None)
+    if memory is not None:
+        state["memory"] = {
+            "window_size": memory.window_size,
+            "token_budget": memory.token_budget,
+            "snippet_chars": memory.snippet_chars,
+            "max_snippets_per_day": memory.max_snippets_per_day,
+            "max_summary_days": memory.max_summary_days,
+            "day": memory.day,
+            "day_summaries": [[day, snippets] for day, snippets in memory.day_summaries.items()],
+        }
+    if hasattr(player, "personality_context_path"):
+        state["personality_context_path"] = player.personality_context_path
+    if hasattr(player, "backend"):
+        # Type du backend (stub, local, groq) : restauré tel quel si l'appelant n'en fournit pas
+        state["backend"] = backend_kind(player.backend)
+    return state
+
+
+def capture(game_manager):
+    """Retourne l'état complet de la partie sous forme de structure JSON."""
+    gm = game_manager
+    night_kill_target = getattr(gm, "night_kill_target", None)
+    return {
+        "seed": gm.seed,
+        "rng": _rng_state(gm.rng),
+        "difficulty": gm.difficulty,
+        "day": gm.day,
+        "num_players_total": gm.num_players_total,
+        "debate_duration": gm.debate_duration,
+        "base_roles": [role_key(r) for r in gm.base_roles],
+        "available_roles": [role_key(r) for r in gm.available_roles],
+        "players": [_player_state(p) for p in gm.players],
+        "lovers": list(gm.lovers) if gm.lovers else None,
+        "is_cupid_phase_done": gm.is_cupid_phase_done,
+        "night_kill_target": night_kill_target.name if night_kill_target else None,
+        "night_protected_target": gm.night_protected_target,
+        "vote_counts": dict(gm.vote_counts),
+        "ancient_shield_triggered": gm.ancient_shield_triggered,
+        "hunter_just_shot": gm.hunter_just_shot,
+        "last_death_was_by_wolf": getattr(gm, "last_death_was_by_wolf", None),
+        "winner_announced": gm._winner_announced,
+        "human_choice": getattr(gm, "human_choice", None),
+        "human_action_type": getattr(gm, "human_action_type", None),
+    }
+
+
+def dumps(game_manager, level=6):
+    """Sauvegarde binaire compacte : en-tête + JSON compressé (zlib)."""
+    payload = json.dumps(capture(game_manager), ensure_ascii=False, separators=(",", ":"))
+    return MAGIC + zlib.compress(payload.encode("utf-8"), level)
+
+
+def decode(data):
+    """Décompresse une sauvegarde (à faire une seule fois pour restaurer plusieurs copies)."""
+    if not data.startswith(MAGIC):
+        raise ValueError("Ce fichier n'est pas une sauvegarde de partie.")
+    return json.loads(zlib.decompress(data[len(MAGIC):]).decode("utf-8"))
+
+
+# --- Restauration ---
+
+def _restore_player(state, backend=None):
+    cls = _load_class(state["class"])
+    # Chemin rapide : pas de __init__ (ni lecture de la personnalité, ni écriture dans context/)
+    player = cls.__new__(cls)
+    for field in PLAYER_FIELDS:
+        setattr(player, field, state[field])
+    player.wolf_teammates = list(state["wolf_teammates"])
+    player.role = Role[state["role"]] if state["role"] else None
+    player.rng = _restore_rng(state["rng"])
+
+    if "history" in state:
+        # Les messages ne sont jamais modifiés sur place : copier la liste suffit
+        player.history = list(state["history"])
+    if hasattr(cls, "history_lock"):
+        player.history_lock = threading.RLock()
+    if "memory" in state:
+        from conversation_memory import ConversationMemory
+
+        memory_state = state["memory"]
+        memory = ConversationMemory(
+            window_size=memory_state["window_size"],
+            token_budget=memory_state["token_budget"],
+            snippet_chars=memory_state["snippet_chars"],
+            max_snippets_per_day=memory_state["max_snippets_per_day"],
+            max_summary_days=memory_state["max_summary_days"],
+        )
+        memory.day = memory_state["day"]
+        memory.day_summaries = {day: list(snippets) for day, snippets in memory_state["day_summaries"]}
+        player.memory = memory
+    if "personality_context_path" in state:
+        player.personality_context_path = state["personality_context_path"]
+    if hasattr(cls, "backend"):
+        player.backend = backend or shared_backend(state.get("backend"))
+    return player
+
+
+def restore(state, event_sink=None, backend=None):
+    """
+    Reconstruit un GameManager à partir d'un état décodé, sans repasser par __init__.
+    Un même état peut être restauré autant de fois que nécessaire (parties parallèles).
+    """
+    gm = GameManager.__new__(GameManager)
+    gm.seed = state["seed"]
+    gm.rng = _restore_rng(state["rng"])
+    gm.agent_factory = None
+    gm.events = EventLog(event_sink, max_in_memory=GameManager.EVENTS_IN_MEMORY)
+    gm._winner_announced = state["winner_announced"]
+    gm.difficulty = state["difficulty"]
+    gm.day = state["day"]
+    gm.num_players_total = state["num_players_total"]
+    gm.debate_duration = state["debate_duration"]
+    gm.base_roles = [Role[key] for key in state["base_roles"]]
+    gm.available_roles = tuple(Role[key] for key in state["available_roles"])
+
+    gm.players = [_restore_player(p, backend) for p in state["players"]]
+    gm.registry = PlayerRegistry(gm.players)
+    gm.human_player = next((p for p in gm.players if p.is_human), None)
+
+    gm.lovers = tuple(state["lovers"]) if state["lovers"] else None
+    gm.is_cupid_phase_done = state["is_cupid_phase_done"]
+    gm.night_kill_target = gm.registry.get(state["night_kill_target"]) if state["night_kill_target"] else None
+    gm.night_protected_target = state["night_protected_target"]
+    gm.vote_counts = defaultdict(int, state["vote_counts"])
+    gm.ancient_shield_triggered = state["ancient_shield_triggered"]
+    gm.hunter_just_shot = state["hunter_just_shot"]
+    gm.last_death_was_by_wolf = state.get("last_death_was_by_wolf")  # Absent des sauvegardes plus anciennes
+    gm.last_death_outcomes = []
+    gm.human_choice = state["human_choice"]
+    gm.human_action_type = state["human_action_type"]
+    return gm
+
+
+def loads(data, event_sink=None, backend=None):
+    """Restaure une partie depuis une sauvegarde binaire."""
+    return restore(decode(data), event_sink=event_sink, backend=backend)
+
+
+def save(game_manager, path):
+    with open(path, "wb") as file:
+        file.write(dumps(game_manager))
+
+
+def load(path, event_sink=None, backend=None):
+    with open(path, "rb") as file:
+        return loads(file.read(), event_sink=event_sink, backend=backend)
+
+
+def reseed(game_manager, seed):
+    """Donne une nouvelle graine à une partie restaurée (et aux flux de ses agents) pour la faire diverger."""
+    game_manager.seed = seed
+    game_manager.rng = SeededRandom(seed)
+    for player in game_manager.players:
+        if not player.is_human:
+            player.rng = SeededRandom(game_manager.rng.getrandbits(64))
+
+
+def fork(data, count, seeds=None, backend=None):
+    """
+    Restaure `count` copies indépendantes d'une même position (décodée une seule fois).
+    Sans `seeds`, toutes les copies poursuivent la partie à l'identique.
+    """
+    state = decode(data) if isinstance(data, (bytes, bytearray)) else data
+    games = []
+    for i in range(count):
+        game_manager = restore(state, backend=backend)
+        if seeds is not None:
+            reseed(game_manager, seeds[i])
+        games.append(game_manager)
+    return games
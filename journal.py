@@ -0,0 +1,120 @@
+# journal.py
+
+import os
+import time
+import threading
+from collections import deque
+from itertools import islice
+
+
+class Journal:
+    """
+    Journal de bord de l'interface, de taille constante en mémoire :
+    - les `capacity` derniers messages sont gardés dans un anneau (ce que l'on peut afficher / faire défiler) ;
+    - l'historique complet est écrit au fil de l'eau dans un fichier texte tournant
+      (`max_bytes` par fichier, `backups` anciens fichiers journal.log.1, .2...).
+      Si le fichier ne peut pas être ouvert ou écrit (dossier en lecture seule, disque plein...),
+      le journal continue en mémoire seulement (`file_error` garde la cause).
+    S'utilise comme l'ancienne liste (`append`, `reversed`, `len`) ; les ajouts peuvent venir de
+    n'importe quel thread.
+    """
+
+    def __init__(self, capacity=500, path=None, max_bytes=1_000_000, backups=3):
+        self.capacity = capacity
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.total = 0  # Nombre de messages depuis le début (y compris ceux sortis de l'anneau)
+        self._ring = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._file = None
+        self._size = 0
+        self.file_error = None
+        if path:
+            try:
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._open()
+            except OSError as error:
+                self._disable_file(error)
+
+    def _open(self):
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+
+    def _rotate(self):
+        self._file.close()
+        for i in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{i}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._open()
+
+    def _disable_file(self, error):
+        """Passe en mémoire seulement après une erreur d'écriture."""
+        self.file_error = error
+        if self._file:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+        self._file = None
+
+    def _spill(self, message):
+        line = f"{time.strftime('%H:%M:%S')} {message}\n"
+        size = len(line.encode("utf-8"))
+        if self._size and self._size + size > self.max_bytes:
+            self._rotate()
+        self._file.write(line)
+        self._file.flush()
+        self._size += size
+
+    def append(self, message):
+        message = str(message)
+        with self._lock:
+            self._ring.append(message)
+            self.total += 1
+            if self._file:
+                try:
+                    self._spill(message)
+                except OSError as error:
+                    self._disable_file(error)
+
+    def __len__(self):
+        """Nombre de messages disponibles en mémoire (au plus `capacity`)."""
+        return len(self._ring)
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._ring))
+
+    def __reversed__(self):
+        with self._lock:
+            return iter(list(reversed(self._ring)))
+
+    def window(self, count, offset=0):
+        """
+        Les `count` messages visibles, du plus récent au plus ancien, en sautant les `offset`
+        plus récents (défilement). Ne parcourt que offset + count messages, quelle que soit la taille du journal.
+        """
+        with self._lock:
+            return list(islice(reversed(self._ring), offset, offset + count))
+
+    def offset_for(self, anchor):
+        """
+        Décalage à passer à window() pour que le message numéro `anchor` (compté comme `total`)
+        reste le plus récent affiché : le défilement ne bouge pas quand de nouveaux messages arrivent.
+        """
+        with self._lock:
+            return max(0, min(len(self._ring) - 1, self.total - anchor))
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,416 @@
+# llm_backends.py
+
+import os
+import re
+import json
+import time
+import random
+import queue
+import threading
+import http.client
+import urllib.parse
+from abc import ABC, abstractmethod
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Nombre maximum de connexions HTTP ouvertes simultanément par backend partagé
+DEFAULT_MAX_CONNECTIONS = int(os.environ.get("LLM_MAX_CONNECTIONS", "10"))
+
+
+# --- Interface commune ---
+
+class LLMBackend(ABC):
+    """
+    Interface commune des fournisseurs de LLM utilisés par ChatAgent.
+    `messages` est un historique au format chat ({"role": ..., "content": ...}).
+    Seul `complete` est obligatoire : une sous-classe qui ne le définit pas ne peut pas être instanciée.
+    """
+
+    @abstractmethod
+    def complete(self, messages, model, temperature=0.9, max_tokens=None, json_mode=False, priority=None):
+        """
+        Retourne la réponse complète (texte). `json_mode` demande un objet JSON valide.
+        `priority` n'est utilisé que par les backends ordonnancés (voir llm_scheduler).
+        """
+
+    def stream(self, messages, model, temperature=0.9, max_tokens=None, priority=None):
+        """Produit la réponse morceau par morceau. Par défaut : un seul morceau."""
+        yield self.complete(messages, model, temperature=temperature, max_tokens=max_tokens)
+
+
+# --- Groq (API distante) ---
+
+class GroqBackend(LLMBackend):
+    """Backend Groq (API officielle)."""
+
+    def __init__(self, api_key=None, max_connections=None):
+        # Imports tardifs : le jeu fonctionne hors-ligne sans le SDK Groq
+        import httpx
+        from groq import Groq
+
+        api_key = api_key or os.environ.get("GROQ_KEY")
+        if not api_key:
+            raise EnvironmentError("GROQ_KEY non trouvée. Assurez-vous d'avoir un fichier .env.")
+
+        # Un seul client HTTP (connexions keep-alive réutilisées) partagé par tous les agents
+        max_connections = max_connections or DEFAULT_MAX_CONNECTIONS
+        self.http_client = httpx.Client(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(60.0, connect=10.0)
+        )
+        # Les refus 429 sont réessayés par l'ordonnanceur (llm_scheduler), pas par le SDK
+        self.client = Groq(api_key=api_key, http_client=self.http_client, max_retries=0)
+
+    def complete(self, messages, model, temperature=0.9, max_tokens=None, json_mode=False, priority=None):
+        kwargs = {"max_tokens": max_tokens} if max_tokens else {}
+        if json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
+        return self.client.chat.completions.create(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            **kwargs
+        ).choices[0].message.content
+
+    def stream(self, messages, model, temperature=0.9, max_tokens=None, priority=None):
+        kwargs = {"max_tokens": max_tokens} if max_tokens else {}
+        response = self.client.chat.completions.create(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            stream=True,
+            **kwargs
+        )
+        for chunk in response:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+
+
+# --- Serveur local compatible OpenAI (llama.cpp, vLLM, Ollama, stub_server...) ---
+
+class _ConnectionPool:
+    """Pool de connexions HTTP keep-alive vers un même hôte (au plus `max_connections` ouvertes)."""
+
+    def __init__(self, base_url, max_connections, timeout):
+        parsed = urllib.parse.urlsplit(base_url)
+        self.connection_class = http.client.HTTPSConnection if parsed.scheme == "https" else http.client.HTTPConnection
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._idle = queue.LifoQueue()
+
+    def acquire(self):
+        """Réserve un créneau et retourne une connexion (réutilisée si possible)."""
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self.connection_class(self.host, self.port, timeout=self.timeout)
+
+    def release(self, connection, reusable=True):
+        """Rend la connexion au pool (ou la ferme si elle n'est plus réutilisable)."""
+        if reusable:
+            self._idle.put(connection)
+        else:
+            connection.close()
+        self._slots.release()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class HTTPStatusError(RuntimeError):
+    """Réponse HTTP en erreur ; `status_code` et `response` (en-têtes, ex. Retry-After) sont lus par llm_scheduler."""
+
+    def __init__(self, response, detail=""):
+        super().__init__(f"HTTP {response.status} : {detail[:200]}")
+        self.status_code = response.status
+        self.response = response
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    """Backend HTTP pour tout serveur exposant /v1/chat/completions (connexions keep-alive mutualisées)."""
+
+    def __init__(self, base_url=None, api_key=None, timeout=60, max_connections=None):
+        self.base_url = (base_url or os.environ.get("LLM_BASE_URL", "http://localhost:8000/v1")).rstrip("/")
+        self.api_key = api_key or os.environ.get("LLM_API_KEY", "")
+        self.timeout = timeout
+        self.path = urllib.parse.urlsplit(self.base_url).path + "/chat/completions"
+        self.pool = _ConnectionPool(self.base_url, max_connections or DEFAULT_MAX_CONNECTIONS, timeout)
+
+    def _headers(self):
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    def _send(self, payload):
+        """Envoie la requête sur une connexion du pool. Retourne (connexion, réponse)."""
+        body = json.dumps(payload).encode("utf-8")
+        for attempt in range(2):
+            connection = self.pool.acquire()
+            try:
+                connection.request("POST", self.path, body=body, headers=self._headers())
+                response = connection.getresponse()
+            except (http.client.HTTPException, ConnectionError, OSError):
+                # Connexion keep-alive fermée par le serveur entre deux appels : on réessaie une fois
+                self.pool.release(connection, reusable=False)
+                if attempt:
+                    raise
+                continue
+            if response.status >= 400:
+                detail = response.read().decode("utf-8", errors="replace")
+                self.pool.release(connection, reusable=not response.will_close)
+                raise HTTPStatusError(response, detail)
+            return connection, response
+
+    @staticmethod
+    def _payload(messages, model, temperature, max_tokens, stream, json_mode=False):
+        payload = {"model": model, "messages": messages, "temperature": temperature, "stream": stream}
+        if max_tokens:
+            payload["max_tokens"] = max_tokens
+        if json_mode:
+            payload["response_format"] = {"type": "json_object"}
+        return payload
+
+    def complete(self, messages, model, temperature=0.9, max_tokens=None, json_mode=False, priority=None):
+        connection, response = self._send(self._payload(messages, model, temperature, max_tokens, False, json_mode))
+        try:
+            body = json.loads(response.read().decode("utf-8"))
+        except Exception:
+            self.pool.release(connection, reusable=False)
+            raise
+        self.pool.release(connection, reusable=not response.will_close)
+        return body["choices"][0]["message"]["content"]
+
+    def stream(self, messages, model, temperature=0.9, max_tokens=None, priority=None):
+        connection, response = self._send(self._payload(messages, model, temperature, max_tokens, True))
+        reusable = False
+        try:
+            for raw_line in response:
+                line = raw_line.decode("utf-8").strip()
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                delta = json.loads(data)["choices"][0].get("delta", {}).get("content")
+                if delta:
+                    yield delta
+            response.read()  # Vide la réponse pour pouvoir réutiliser la connexion
+            reusable = not response.will_close
+        finally:
+            self.pool.release(connection, reusable=reusable)
+
+
+# --- Stub local déterministe ---
+
+# Les prompts de vote et de nuit se terminent par "... : Nom1, Nom2, Nom3. RÈGLE ..."
+_CANDIDATES_PATTERN = re.compile(r":\s*([^:]+?)\.\s+RÈGLE")
+DEBATE_PROMPT_MARKER = "RÉSUMÉ DU DÉBAT RÉCENT"
+# Le prompt de vote groupé contient une ligne par votant : '- Votant "Nom" ... cibles possibles : A, B, C'
+_BATCH_VOTER_PATTERN = re.compile(r'^- Votant "(.+?)".*?cibles possibles : (.+)$', re.MULTILINE)
+
+DEFAULT_DEBATE_LINES = [
+    "Ton silence t'accuse, avoue tout de suite !",
+    "Je vote contre celui qui change d'avis sans arrêt.",
+    "Arrête de détourner l'attention, c'est louche.",
+    "Tu défends trop vite ton voisin, pourquoi ?",
+    "Je suis innocent, regardez plutôt qui m'accuse !",
+]
+
+
+class ScriptedBackend(LLMBackend):
+    """
+    Stand-in local et déterministe (aucun appel réseau).
+    - `responses` : réponses rejouées en boucle ; sinon, le stub choisit un joueur valide dans
+      les prompts de vote/nuit et une réplique type pour le débat.
+    - `latency` / `jitter` : délai simulé (secondes) avant la réponse.
+    Les réponses par défaut ne dépendent que de la graine et de la conversation envoyée, pas de
+    l'ordre d'arrivée des appels : une partie à graine fixe reste reproductible avec des appels parallèles.
+    """
+
+    def __init__(self, responses=None, latency=0.0, jitter=0.0, seed=0):
+        self.responses = list(responses) if responses else None
+        self.latency = latency
+        self.jitter = jitter
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._index = 0
+
+    def _next_answer(self, messages):
+        with self._lock:
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            if self.responses:
+                answer = self.responses[self._index % len(self.responses)]
+                self._index += 1
+            else:
+                answer = None
+        if answer is None:
+            rng = random.Random(f"{self.seed}|" + json.dumps(messages, ensure_ascii=False))
+            answer = self._default_answer(str(messages[-1]["content"]) if messages else "", rng)
+        return answer, delay
+
+    def _default_answer(self, prompt, rng):
+        # Vote groupé : une cible valide par votant, au format JSON
+        ballots = _BATCH_VOTER_PATTERN.findall(prompt)
+        if ballots:
+            return json.dumps({
+                voter: rng.choice(candidates.split(", "))
+                for voter, candidates in ballots
+            }, ensure_ascii=False)
+        # Le prompt de débat cite les messages récents (qui peuvent contenir d'anciens prompts de vote)
+        if DEBATE_PROMPT_MARKER in prompt:
+            return rng.choice(DEFAULT_DEBATE_LINES)
+        match = _CANDIDATES_PATTERN.search(prompt)
+        if match:
+            candidates = [name.strip() for name in match.group(1).split(", ") if name.strip()]
+            if candidates:
+                return rng.choice(candidates)
+        return rng.choice(DEFAULT_DEBATE_LINES)
+
+    def complete(self, messages, model, temperature=0.9, max_tokens=None, json_mode=False, priority=None):
+        answer, delay = self._next_answer(messages)
+        if delay > 0:
+            time.sleep(delay)
+        return answer
+
+    def stream(self, messages, model, temperature=0.9, max_tokens=None, priority=None):
+        answer, delay = self._next_answer(messages)
+        if delay > 0:
+            time.sleep(delay)
+        words = answer.split(" ")
+        for i, word in enumerate(words):
+            yield word if i == len(words) - 1 else word + " "
+
+
+def default_backend(kind=None):
+    """
+    Construit un nouveau backend du type choisi par la variable d'environnement LLM_BACKEND :
+    "groq" (défaut), "local" (serveur compatible OpenAI sur LLM_BASE_URL) ou "stub".
+    """
+    kind = (kind or os.environ.get("LLM_BACKEND", "groq")).lower()
+    if kind == "stub":
+        return ScriptedBackend(
+            latency=float(os.environ.get("LLM_STUB_LATENCY", "0")),
+            jitter=float(os.environ.get("LLM_STUB_JITTER", "0"))
+        )
+    if kind == "local":
+        return OpenAICompatibleBackend()
+    return GroqBackend()
+
+
+def backend_kind(backend):
+    """
+    Type ("groq", "local" ou "stub") du backend réel derrière ses enveloppes (ordonnanceur, cassette),
+    tel qu'accepté par default_backend / shared_backend ; None s'il n'y en a pas (rejeu de cassette).
+    """
+    while backend is not None:
+        if isinstance(backend, ScriptedBackend):
+            return "stub"
+        if isinstance(backend, GroqBackend):
+            return "groq"
+        if isinstance(backend, OpenAICompatibleBackend):
+            return "local"
+        backend = getattr(backend, "backend", None)
+    return None
+
+
+# --- Backends partagés (un seul client par processus) ---
+
+_SHARED_BACKENDS = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_backend(kind=None):
+    """
+    Retourne le backend du processus pour ce type, en le créant au premier appel.
+    Tous les agents (et toutes les parties successives) partagent ainsi les mêmes connexions
+    et le même ordonnanceur (limites de débit, priorités, réessais sur 429).
+    """
+    from llm_scheduler import LLMScheduler, SchedulingBackend
+    from llm_cassette import CassetteBackend, active_cassette
+
+    kind = (kind or os.environ.get("LLM_BACKEND", "groq")).lower()
+    cassette = active_cassette()
+    with _SHARED_LOCK:
+        backend = _SHARED_BACKENDS.get(kind)
+        if backend is None:
+            if cassette and cassette.mode == "replay":
+                # Rejeu : réponses servies depuis le disque, sans réseau ni limites de débit
+                backend = CassetteBackend(cassette)
+            else:
+                backend = SchedulingBackend(default_backend(kind), LLMScheduler.from_env())
+                if cassette:
+                    backend = CassetteBackend(cassette, backend)
+            _SHARED_BACKENDS[kind] = backend
+        return backend
+
+
+# --- Serveur de stub (pour tester OpenAICompatibleBackend de bout en bout) ---
+
+def serve_stub(host="127.0.0.1", port=8000, backend=None):
+    """Expose un ScriptedBackend sur http://host:port/v1/chat/completions (format OpenAI)."""
+    backend = backend or ScriptedBackend()
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, comme un vrai serveur d'inférence
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self.send_error(404)
+                return
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length).decode("utf-8"))
+            args = (payload.get("messages", []), payload.get("model", "stub"),
+                    payload.get("temperature", 0.9), payload.get("max_tokens"))
+
+            if payload.get("stream"):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                for chunk in backend.stream(*args):
+                    event = {"choices": [{"index": 0, "delta": {"content": chunk}}]}
+                    self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                self.wfile.write(b"data: [DONE]\n\n")
+                return
+
+            body = json.dumps({
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": backend.complete(*args)}}]
+            }).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    print(f"Stub LLM à l'écoute sur http://{host}:{port}/v1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serveur LLM local de substitution (format OpenAI).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    serve_stub(args.host, args.port, ScriptedBackend(latency=args.latency, jitter=args.jitter, seed=args.seed))
@@ -0,0 +1,163 @@
+# llm_cassette.py
+
+import os
+import json
+import random
+import hashlib
+import threading
+from collections import defaultdict, deque
+
+from llm_backends import LLMBackend
+
+
+class CassetteMiss(KeyError):
+    """Aucune réponse enregistrée pour ce prompt (la partie rejouée a divergé de l'enregistrement)."""
+
+
+class Cassette:
+    """
+    Fichier JSONL d'enregistrement des échanges LLM d'une session (une ou plusieurs parties).
+    - une ligne {"seed": ...} au début de chaque partie (graine de son générateur aléatoire)
+    - une ligne par appel : {"key": <hash du prompt normalisé>, "response": ...}
+    En mode "replay", les réponses sont servies depuis le disque, dans l'ordre d'enregistrement
+    pour un même prompt, et les parties successives retrouvent leurs graines dans l'ordre.
+    """
+
+    def __init__(self, path, mode="record", seed=None):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Mode de cassette inconnu : {mode}")
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._responses = defaultdict(deque)
+        self._last_response = {}
+
+        self.seed = None  # Graine de la dernière partie commencée
+        self._seeds = deque()  # Graines enregistrées des parties à rejouer
+
+        if mode == "record":
+            # LLM_SEED fixe la graine de la 1re partie et, de proche en proche, celles des suivantes
+            self._first_seed = seed
+            self._seed_rng = random.Random(seed) if seed is not None else random.SystemRandom()
+            self._file = open(path, "w", encoding="utf-8")
+        else:
+            self._file = None
+            with open(path, "r", encoding="utf-8") as file:
+                for line in file:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if "seed" in entry:
+                        self._seeds.append(entry["seed"])
+                    else:
+                        self._responses[entry["key"]].append(entry["response"])
+
+    @staticmethod
+    def key(model, messages, temperature, max_tokens=None, json_mode=False):
+        """Hash du prompt normalisé (espaces compactés) et des paramètres d'appel."""
+        normalized = [
+            [m["role"], " ".join(str(m["content"]).split())]
+            for m in messages
+        ]
+        payload = json.dumps([model, normalized, temperature, max_tokens, json_mode], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _write(self, entry):
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def next_seed(self, seed=None):
+        """
+        Graine de la partie qui commence (appelé par chaque nouveau GameManager).
+        - "record" : une graine neuve par partie (ou `seed` si elle est imposée), écrite dans le fichier ;
+        - "replay" : la graine enregistrée suivante (`seed` imposée l'emporte, mais consomme son rang).
+        Retourne None en rejeu quand toutes les parties enregistrées ont déjà été rejouées.
+        """
+        with self._lock:
+            if self.mode == "record":
+                if seed is None:
+                    seed = self._first_seed if self.seed is None and self._first_seed is not None \
+                        else self._seed_rng.randrange(2 ** 32)
+                self._write({"seed": seed})
+            else:
+                recorded = self._seeds.popleft() if self._seeds else None
+                seed = recorded if seed is None else seed
+            self.seed = seed
+            return seed
+
+    def record(self, key, response):
+        with self._lock:
+            self._write({"key": key, "response": response})
+
+    def play(self, key):
+        with self._lock:
+            pending = self._responses.get(key)
+            if pending:
+                response = pending.popleft()
+                self._last_response[key] = response
+                return response
+            # Prompt rejoué plus souvent qu'enregistré : on ressert la dernière réponse
+            if key in self._last_response:
+                return self._last_response[key]
+        raise CassetteMiss(key)
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+class CassetteBackend(LLMBackend):
+    """Backend qui enregistre (mode "record") ou rejoue instantanément (mode "replay") les réponses."""
+
+    def __init__(self, cassette, backend=None):
+        if cassette.mode == "record" and backend is None:
+            raise ValueError("Un backend réel est nécessaire pour enregistrer une cassette.")
+        self.cassette = cassette
+        self.backend = backend
+
+    def complete(self, messages, model, temperature=0.9, max_tokens=None, json_mode=False, priority=None):
+        key = Cassette.key(model, messages, temperature, max_tokens, json_mode)
+        if self.cassette.mode == "replay":
+            return self.cassette.play(key)
+        response = self.backend.complete(messages, model, temperature=temperature, max_tokens=max_tokens,
+                                         json_mode=json_mode, priority=priority)
+        self.cassette.record(key, response)
+        return response
+
+    def stream(self, messages, model, temperature=0.9, max_tokens=None, priority=None):
+        # Même clé qu'un appel complet : une réponse enregistrée en stream peut être rejouée d'un bloc
+        key = Cassette.key(model, messages, temperature, max_tokens)
+        if self.cassette.mode == "replay":
+            yield self.cassette.play(key)
+            return
+        chunks = []
+        for chunk in self.backend.stream(messages, model, temperature=temperature, max_tokens=max_tokens,
+                                         priority=priority):
+            chunks.append(chunk)
+            yield chunk
+        self.cassette.record(key, "".join(chunks))
+
+
+_ACTIVE_CASSETTE = None
+_CASSETTE_LOCK = threading.Lock()
+
+
+def active_cassette():
+    """
+    Cassette du processus, configurée par LLM_CASSETTE (chemin du fichier) et
+    LLM_CASSETTE_MODE ("record" par défaut, ou "replay"). None si aucune n'est configurée.
+    """
+    global _ACTIVE_CASSETTE
+    path = os.environ.get("LLM_CASSETTE")
+    if not path:
+        return None
+    with _CASSETTE_LOCK:
+        if _ACTIVE_CASSETTE is None:
+            seed = os.environ.get("LLM_SEED")
+            _ACTIVE_CASSETTE = Cassette(
+                path,
+                mode=os.environ.get("LLM_CASSETTE_MODE", "record").lower(),
+                seed=int(seed) if seed else None
+            )
+        return _ACTIVE_CASSETTE
@@ -0,0 +1,256 @@
+# llm_scheduler.py
+
+import os
+import time
+import heapq
+import random
+import itertools
+import threading
+from contextlib import contextmanager
+
+from llm_backends import LLMBackend
+from decision_runner import CallAbandoned, current_ticket
+
+
+# --- Priorités (plus petit = plus urgent) ---
+PRIORITY_NIGHT = 0   # Actions de nuit : bloquent la transition vers le jour
+PRIORITY_VOTE = 1    # Votes : bloquent le résultat du lynchage
+PRIORITY_DEBATE = 2  # Répliques du débat : cosmétiques, passent en dernier
+
+PRIORITY_NAMES = {PRIORITY_NIGHT: "nuit", PRIORITY_VOTE: "vote", PRIORITY_DEBATE: "débat"}
+
+
+def estimate_tokens(messages):
+    """Estimation grossière (≈ 4 caractères par token + surcoût par message)."""
+    return sum(len(str(m["content"])) // 4 + 4 for m in messages)
+
+
+class TokenBucket:
+    """Seau à jetons : `rate_per_minute` jetons rechargés en continu, `capacity` au maximum."""
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        """Secondes à attendre avant de pouvoir consommer `amount` jetons (0 si possible tout de suite)."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount):
+        self.tokens -= min(amount, self.capacity)
+
+
+class LLMScheduler:
+    """
+    Ordonnanceur central des appels LLM.
+    - File de priorité : une décision de nuit ou de vote passe avant les répliques du débat.
+    - Limiteurs requêtes/minute et tokens/minute (seaux à jetons), concurrence maximale.
+    - Statistiques : profondeur de file et temps d'attente par priorité.
+    Une requête dont la décision a été abandonnée (run_decisions, hors délai) quitte la file sans
+    consommer de budget : elle ne passe pas devant les appels encore attendus.
+    """
+
+    ABANDON_POLL = 0.1  # Secondes entre deux vérifications du jeton d'une requête en attente
+
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None, max_concurrency=None):
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_concurrency = max_concurrency
+        self._condition = threading.Condition()
+        self._waiting = []  # tas de (priorité, ordre d'arrivée)
+        self._sequence = itertools.count()
+        self._active = 0
+        self._wait_stats = {}  # priorité -> [nombre, temps total, temps max]
+        self.rate_limited_count = 0
+        self.abandoned_count = 0
+
+    @classmethod
+    def from_env(cls):
+        """Limites lues dans LLM_RPM, LLM_TPM et LLM_MAX_CONCURRENCY (absentes = illimité)."""
+        def read(name):
+            value = os.environ.get(name)
+            return int(value) if value else None
+        return cls(read("LLM_RPM"), read("LLM_TPM"), read("LLM_MAX_CONCURRENCY"))
+
+    def _wait_for_budget(self, estimated_tokens):
+        """Temps d'attente imposé par les limiteurs (appelé sous le verrou)."""
+        now = time.monotonic()
+        wait = 0.0
+        if self.request_bucket:
+            wait = max(wait, self.request_bucket.wait_time(1, now))
+        if self.token_bucket:
+            wait = max(wait, self.token_bucket.wait_time(estimated_tokens, now))
+        return wait
+
+    @contextmanager
+    def slot(self, priority, estimated_tokens=0):
+        """Bloque jusqu'à ce que l'appel soit le plus prioritaire et que les limites le permettent."""
+        entry = (priority, next(self._sequence))
+        enqueued_at = time.monotonic()
+        ticket = current_ticket()  # Décision lancée par run_decisions (None sinon)
+        poll = self.ABANDON_POLL if ticket is not None else None
+
+        with self._condition:
+            heapq.heappush(self._waiting, entry)
+            while True:
+                if ticket is not None and ticket.abandoned:
+                    # Décision abandonnée pendant l'attente : la requête sort de la file sans rien consommer
+                    self._waiting.remove(entry)
+                    heapq.heapify(self._waiting)
+                    self.abandoned_count += 1
+                    self._condition.notify_all()
+                    raise CallAbandoned("Requête LLM abandonnée avant son envoi.")
+                if self._waiting[0] == entry and (self.max_concurrency is None or self._active < self.max_concurrency):
+                    wait = self._wait_for_budget(estimated_tokens)
+                    if wait <= 0:
+                        break
+                    self._condition.wait(timeout=wait if poll is None else min(wait, poll))
+                else:
+                    self._condition.wait(timeout=poll)
+
+            heapq.heappop(self._waiting)
+            if self.request_bucket:
+                self.request_bucket.consume(1)
+            if self.token_bucket:
+                self.token_bucket.consume(estimated_tokens)
+            self._active += 1
+            self._record_wait(priority, time.monotonic() - enqueued_at)
+            # Le suivant dans la file peut peut-être démarrer aussi
+            self._condition.notify_all()
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active -= 1
+                self._condition.notify_all()
+
+    def record_rate_limited(self):
+        """Compte un refus 429 (appelé depuis n'importe quel thread d'appel)."""
+        with self._condition:
+            self.rate_limited_count += 1
+
+    def _record_wait(self, priority, waited):
+        stats = self._wait_stats.setdefault(priority, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += waited
+        stats[2] = max(stats[2], waited)
+
+    def stats(self):
+        """Profondeur de file, appels en cours et temps d'attente (moyen/max) par priorité."""
+        with self._condition:
+            return {
+                "queue_depth": len(self._waiting),
+                "active": self._active,
+                "rate_limited": self.rate_limited_count,
+                "abandoned": self.abandoned_count,
+                "waits": {
+                    PRIORITY_NAMES.get(priority, priority): {
+                        "count": count,
+                        "avg_wait": total / count if count else 0.0,
+                        "max_wait": worst,
+                    }
+                    for priority, (count, total, worst) in sorted(self._wait_stats.items())
+                },
+            }
+
+    def format_stats(self):
+        """Résumé lisible des statistiques (pour le dimensionnement de l'offre API)."""
+        stats = self.stats()
+        lines = [f"File LLM : {stats['queue_depth']} en attente, {stats['active']} en cours, "
+                 f"{stats['rate_limited']} refus 429, {stats['abandoned']} abandonnées"]
+        for name, wait in stats["waits"].items():
+            lines.append(f"  {name} : {wait['count']} appels, attente moy. {wait['avg_wait']:.2f}s, "
+                         f"max {wait['max_wait']:.2f}s")
+        return "\n".join(lines)
+
+
+def is_rate_limited(error):
+    """
+    Vrai si l'erreur correspond à un refus pour dépassement de quota (HTTP 429).
+    Seul le code de statut compte (erreur du SDK Groq, d'httpx ou d'OpenAICompatibleBackend) :
+    le texte du message peut contenir « 429 » ailleurs (nombre de tokens, identifiant de requête...).
+    """
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status == 429
+
+
+def _retry_after(error):
+    """Délai demandé par le fournisseur (en-tête Retry-After), s'il est disponible."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class SchedulingBackend(LLMBackend):
+    """Backend qui fait passer chaque appel par un LLMScheduler et réessaie les refus 429."""
+
+    def __init__(self, backend, scheduler, max_retries=4, backoff=1.0):
+        self.backend = backend
+        self.scheduler = scheduler
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    def _retry_delay(self, error, attempt):
+        self.scheduler.record_rate_limited()
+        delay = _retry_after(error)
+        if delay is None:
+            delay = self.backoff * (2 ** attempt)
+        return delay + random.uniform(0, self.backoff / 2)
+
+    def complete(self, messages, model, temperature=0.9, max_tokens=None, json_mode=False, priority=None):
+        priority = PRIORITY_DEBATE if priority is None else priority
+        estimated = estimate_tokens(messages) + (max_tokens or 100)
+        for attempt in range(self.max_retries + 1):
+            with self.scheduler.slot(priority, estimated):
+                try:
+                    return self.backend.complete(messages, model, temperature=temperature,
+                                                 max_tokens=max_tokens, json_mode=json_mode)
+                except Exception as e:
+                    if not is_rate_limited(e) or attempt == self.max_retries:
+                        raise
+                    delay = self._retry_delay(e, attempt)
+            # On attend hors du créneau pour laisser passer les autres appels
+            time.sleep(delay)
+
+    def stream(self, messages, model, temperature=0.9, max_tokens=None, priority=None):
+        """
+        Le créneau n'est tenu que jusqu'au premier morceau (requête envoyée, en-têtes reçus, refus 429
+        éventuel) : la suite est lue hors du créneau, un consommateur lent ne bloque pas les autres appels.
+        """
+        priority = PRIORITY_DEBATE if priority is None else priority
+        estimated = estimate_tokens(messages) + (max_tokens or 100)
+        for attempt in range(self.max_retries + 1):
+            chunks = None
+            with self.scheduler.slot(priority, estimated):
+                response = self.backend.stream(messages, model, temperature=temperature, max_tokens=max_tokens)
+                try:
+                    first = next(response, None)
+                    chunks = response
+                except Exception as e:
+                    if not is_rate_limited(e) or attempt == self.max_retries:
+                        raise
+                    delay = self._retry_delay(e, attempt)
+            if chunks is None:
+                time.sleep(delay)
+                continue
+            # Une fois des morceaux affichés, on ne peut plus réessayer : les erreurs suivantes remontent
+            if first is not None:
+                yield first
+                yield from chunks
+            return
@@ -9,6 +9,8 @@ import sys
 from dotenv import load_dotenv
 import speech_recognition as sr
 import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
 import math
 import player # Nécessaire pour l'écoute non bloquante
 
@@ -16,6 +18,11 @@ load_dotenv()
 
 from game_core import GameManager, Player 
 from enums_and_roles import Camp, NightAction, Role
+from role_compositions import MAX_PLAYERS, MIN_PLAYERS, max_wolves
+from text_layer import TextLayer
+from journal import Journal
+from event_bus import EventBus, UIEvent
+from night_worker import NightWorker
 
 SCREEN_WIDTH = 1000
 SCREEN_HEIGHT = 700
@@ -186,12 +193,29 @@ class ChatInput:
             self.active = is_in_input
 
 
+class DebateSpeech:
+    """Prise de parole d'une IA, générée en arrière-plan pendant que le message précédent s'affiche."""
+    def __init__(self, speaker, debate_round):
+        self.speaker = speaker
+        self.debate_round = debate_round  # Débat auquel appartient le message (les messages périmés sont ignorés)
+        self.text = ""          # Grandit au fil du stream
+        self.done = False       # Génération terminée
+        self.announced = False  # Message transmis aux autres IA
+
+
 class LoupGarouGame(arcade.Window):
+
+    UI_EVENTS_PER_FRAME = 16  # Événements des threads de travail appliqués par image (rendu fluide)
+    NIGHT_BUDGET = 45         # Secondes accordées aux décisions IA d'une nuit (décisions de secours au-delà)
+    NIGHT_STEPS = (Role.VOYANTE, Role.SALVATEUR, Role.LOUP, Role.SORCIERE)  # Ordre des actions affiché
     
     def __init__(self, width, height, title):
         super().__init__(width, height, title, resizable=True)
         self.set_update_rate(1/60)
 
+        # Textes retenus entre les images (journal, noms, statut, menu)
+        self.text_layer = TextLayer()
+
         self.menu_human_name = "Lucie"
         self.menu_num_players = 11
         self.name_input_active = False
@@ -233,7 +257,11 @@ class LoupGarouGame(arcade.Window):
         self._init_graphics()
 
         # --- VARIABLES DE JEU ET UI ---
-        self.log_messages = [] 
+        # Journal borné en mémoire, historique complet dans un fichier tournant (GAME_JOURNAL, vide = désactivé)
+        self.log_messages = Journal(path=os.getenv("GAME_JOURNAL", os.path.join("logs", "journal.log")) or None)
+        # Défilement à la molette : `total` du journal au message le plus récent affiché
+        # (None : le panneau suit les nouveaux messages)
+        self.log_scroll_anchor = None
         self.player_sprites = arcade.SpriteList()
         self.player_map = {} 
         self.action_buttons = []
@@ -245,6 +273,9 @@ class LoupGarouGame(arcade.Window):
         self.cupid_targets = []
         self.cupid_selection_buttons = []
         self.cupid_indicators = arcade.SpriteList()
+        # Les indicateurs ne sont reconstruits que si la partie change (mort, amoureux, taille)
+        self._indicators_state = None
+        self._indicator_textures = {}
 
         # --- PARAMÈTRES DU DÉBAT ---
         self.debate_timer = 10 
@@ -256,6 +287,29 @@ class LoupGarouGame(arcade.Window):
         self.messages_generated = 0 
         self.max_messages_per_debate = 20 
         self.message_is_complete = False 
+
+        # --- GÉNÉRATION DU DÉBAT EN ARRIÈRE-PLAN ---
+        # Un seul worker : les messages sont produits dans l'ordre, sans bloquer le rendu
+        self.debate_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="debate")
+        self.debate_ready = queue.Queue()
+
+        # --- ÉVÉNEMENTS DES THREADS DE TRAVAIL ---
+        # Les threads (nuit, micro) déposent des événements ; seul on_update touche à l'interface
+        self.ui_events = EventBus()
+        # Nuits calculées sur un thread persistant (Future, progression, annulation, budget de temps)
+        self.night_worker = NightWorker(budget=self.NIGHT_BUDGET)
+        self.night_action = None  # Rôle en train d'agir pendant la nuit (panneau d'état)
+        self.ui_event_handlers = {
+            UIEvent.LOG: lambda data: self.log_messages.append(data["message"]),
+            UIEvent.NIGHT_PROGRESS: self._on_night_progress,
+            UIEvent.NIGHT_DONE: self._on_night_done,
+            UIEvent.SPEECH_RECOGNIZED: self._on_speech_recognized,
+            UIEvent.LISTENING_STOPPED: lambda data: setattr(self, "is_listening", False),
+        }
+        self.pending_speech = None
+        self.current_speech = None
+        self.debate_round = 0
+        self.stream_debate = True  # Les tokens du LLM s'affichent dès leur arrivée
         
         # --- INITIALISATION UI ET STT ---
         self._setup_ui_elements() 
@@ -349,15 +403,42 @@ class LoupGarouGame(arcade.Window):
         if self.sound_wolf_kill:
             arcade.play_sound(self.sound_wolf_kill)
 
-    def _async_night_ai(self):
-        """Exécute la phase de nuit dans un thread séparé pour éviter les lags."""
-        night_message = self.game_manager._night_phase()
-        
-        arcade.schedule(lambda dt: self._finalize_night(night_message), 0)
+    def _start_night_worker(self):
+        """Lance le calcul de la nuit sur le NightWorker ; progression et résultat arrivent par ui_events."""
+        game_manager = self.game_manager
+        self.night_action = None
+        future = self.night_worker.start(
+            game_manager,
+            on_action=lambda role: self.ui_events.post(UIEvent.NIGHT_PROGRESS, role=role, game=game_manager)
+        )
+        future.add_done_callback(lambda f: self._on_night_future(f, game_manager))
 
-    def _finalize_night(self, message):
+    def _on_night_future(self, future, game_manager):
+        """(Thread de nuit) Transmet le résultat de la nuit à la boucle de rendu."""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            print(f"Erreur pendant la nuit : {error}")
+            message = "⚠️ La nuit a été interrompue par une erreur. Le jour se lève quand même."
+        else:
+            message = future.result()
+            if message is None:  # Nuit annulée
+                return
+        # La suite (sons, journal, passage au jour) se fait dans le thread de rendu
+        self.ui_events.post(UIEvent.NIGHT_DONE, message=message, game=game_manager)
+
+    def _on_night_progress(self, data):
+        if data["game"] is self.game_manager:
+            self.night_action = data["role"]
 
-        arcade.unschedule(self._finalize_night) 
+    def _on_night_done(self, data):
+        # Une nuit d'une partie abandonnée (nouvelle partie) est ignorée
+        if data["game"] is self.game_manager:
+            self.night_action = None
+            self._finalize_night(data["message"])
+
+    def _finalize_night(self, message):
 
         self.log_messages.append(message)
 
@@ -378,7 +459,7 @@ class LoupGarouGame(arcade.Window):
             self.game_manager.ancient_shield_triggered = False
 
         # 4. Transition d'état vers le jour (Débat)
-        self.game_manager.day += 1
+        self.game_manager.start_new_day()
         self.night_processing = False
         self.current_state = GameState.DEBATE
         
@@ -448,7 +529,8 @@ class LoupGarouGame(arcade.Window):
         angle_step = 360 / num_players
         
         available_images = [f for f in os.listdir(IMAGE_DIR) if f.endswith(('.png', '.jpg', '.jpeg'))]
-        random.shuffle(available_images)
+        # Flux séparé (même graine) : redimensionner la fenêtre ne consomme pas le hasard de la partie
+        random.Random(self.game_manager.seed).shuffle(available_images)
         
         SPRITE_SCALE = 0.1
         # Calculer le rayon du cercle en fonction du nombre de joueurs
@@ -610,13 +692,15 @@ class LoupGarouGame(arcade.Window):
         """Gère tous les clics dans le menu de configuration."""
         # Boutons Joueurs
         if self.btn_plus.check_click(x, y):
-            self.menu_num_players = min(15, self.menu_num_players + 1)
+            self.menu_num_players = min(MAX_PLAYERS, self.menu_num_players + 1)
         elif self.btn_minus.check_click(x, y):
-            self.menu_num_players = max(6, self.menu_num_players - 1)
+            self.menu_num_players = max(MIN_PLAYERS, self.menu_num_players - 1)
+            # Pas plus de loups que la moitié de la table (compositions du catalogue)
+            self.menu_num_wolves = min(self.menu_num_wolves, max_wolves(self.menu_num_players))
         
         # Boutons Loups
         elif self.btn_wolf_plus.check_click(x, y):
-            self.menu_num_wolves = min(self.menu_num_players // 2, self.menu_num_wolves + 1)
+            self.menu_num_wolves = min(max_wolves(self.menu_num_players), self.menu_num_wolves + 1)
         elif self.btn_wolf_minus.check_click(x, y):
             self.menu_num_wolves = max(1, self.menu_num_wolves - 1)
 
@@ -659,10 +743,29 @@ class LoupGarouGame(arcade.Window):
                     self.current_state = GameState.NIGHT_IA_ACTION
                     return
                 
+    def _indicator_sprite(self, key, factory, x, y, angle=0):
+        """Sprite d'indicateur dont la texture (croix, UwU, cœur) n'est créée qu'une fois."""
+        texture = self._indicator_textures.get(key)
+        if texture is None:
+            texture = factory().texture
+            self._indicator_textures[key] = texture
+        sprite = arcade.Sprite()
+        sprite.texture = texture
+        sprite.position, sprite.angle = (x, y), angle
+        return sprite
+
     def _update_cupid_visuals(self):
         
         if self.game_manager is None:
             return
+
+        # Rien n'a changé depuis la dernière construction : on garde les sprites existants
+        # Clé sur la partie elle-même : un id() peut être réutilisé par le registre d'une nouvelle partie
+        registry = self.game_manager.registry
+        state = (self.game_manager, registry.version, self.game_manager.lovers)
+        if state == self._indicators_state:
+            return
+        self._indicators_state = state
         
         self.cupid_indicators.clear()
 
@@ -674,16 +777,15 @@ class LoupGarouGame(arcade.Window):
                     # On crée un "X" avec deux traits rouges
                     size = int(sprite.width * 0.8)
                     thickness = 5 # Croix bien visible
+                    make_line = lambda: arcade.SpriteSolidColor(size, thickness, arcade.color.RED)
                     
                     # Branche 1 : \
-                    line1 = arcade.SpriteSolidColor(size, thickness, arcade.color.RED)
-                    line1.position, line1.angle = sprite.position, 45
-                    self.cupid_indicators.append(line1)
+                    self.cupid_indicators.append(
+                        self._indicator_sprite(("cross", size), make_line, *sprite.position, angle=45))
                     
                     # Branche 2 : /
-                    line2 = arcade.SpriteSolidColor(size, 5, arcade.color.RED)
-                    line2.position, line2.angle = sprite.position, -45
-                    self.cupid_indicators.append(line2)
+                    self.cupid_indicators.append(
+                        self._indicator_sprite(("cross", size), make_line, *sprite.position, angle=-45))
 
         if self.game_manager.lovers and len(self.game_manager.lovers) == 2:
             n1, n2 = self.game_manager.lovers
@@ -695,16 +797,18 @@ class LoupGarouGame(arcade.Window):
                 # 2. TEXTES : On les monte à +85 pour éviter la superposition
                 for s in [s1, s2]:
                     # Le texte "UwU"
-                    uwu = arcade.create_text_sprite(text="UwU", color=arcade.color.RED, font_size=14)
-                    uwu.center_x = s.center_x - 15
-                    uwu.center_y = s.center_y + 85  # Augmenté pour être au-dessus du nom
-                    self.cupid_indicators.append(uwu)
+                    self.cupid_indicators.append(self._indicator_sprite(
+                        ("text", "UwU"),
+                        lambda: arcade.create_text_sprite(text="UwU", color=arcade.color.RED, font_size=14),
+                        s.center_x - 15, s.center_y + 85  # Augmenté pour être au-dessus du nom
+                    ))
 
                     # Le coeur
-                    heart = arcade.create_text_sprite(text="❤️", color=arcade.color.RED, font_size=18)
-                    heart.center_x = s.center_x + 20
-                    heart.center_y = s.center_y + 85
-                    self.cupid_indicators.append(heart)
+                    self.cupid_indicators.append(self._indicator_sprite(
+                        ("text", "❤️"),
+                        lambda: arcade.create_text_sprite(text="❤️", color=arcade.color.RED, font_size=18),
+                        s.center_x + 20, s.center_y + 85
+                    ))
                 
     def _handle_cupid_selection_click(self, x, y):
         """Gère la sélection des amoureux et valide le lien."""
@@ -760,10 +864,9 @@ class LoupGarouGame(arcade.Window):
                 if sprite.collides_with_point((x, y)):
                     target = self.game_manager.get_player_by_name(name)
                     if target and target.is_alive and target != self.human_player:
-                        target.is_alive = False
-                        self.human_player.has_kill_potion = False
-                        self.game_manager.night_kill_target = name 
+                        death_message = self.game_manager.use_kill_potion(self.human_player, name)
                         self.log_messages.append(f"🧪 La Sorcière a empoisonné {name}.")
+                        self.log_messages.append(death_message)
                     
                         # C'est seulement ICI qu'on termine le tour
                         self.witch_choosing_target = False
@@ -793,15 +896,21 @@ class LoupGarouGame(arcade.Window):
     def _finalize_setup_and_start(self):
         """Initialise le moteur de jeu et lance la première phase."""
         diff_choisie = self.difficulty_levels[self.menu_diff_index]
+        # Une nuit encore en calcul appartient à l'ancienne partie
+        self.night_worker.cancel()
+        self.night_processing = False
+        if self.game_manager is not None:
+            self.game_manager.close()  # Libère le fichier d'événements de l'ancienne partie
         self.game_manager = GameManager(
             human_player_name=self.menu_human_name,
             num_players_total=self.menu_num_players,
             difficulty=diff_choisie
         )
+        self._indicators_state = None  # Nouvelle partie : les indicateurs seront reconstruits
 
         selected_role = self.available_roles[self.menu_role_index]
         if selected_role == "ALEATOIRE":
-            selected_role = random.choice(self.available_roles[1:])
+            selected_role = self.game_manager.rng.choice(self.available_roles[1:])
         
         self.human_player = self.game_manager.human_player
         self.human_player.assign_role(selected_role)
@@ -845,18 +954,19 @@ class LoupGarouGame(arcade.Window):
             self.log_messages.append("🎙️ Micro désactivé.")
 
     def _listen_for_speech(self):
-        """Tente d'écouter et de reconnaître la parole."""
+        """(Thread du micro) Tente d'écouter et de reconnaître la parole ; le résultat passe par ui_events."""
+        log = lambda message: self.ui_events.post(UIEvent.LOG, message=message)
         with self.mic as source:
             self.recognizer.adjust_for_ambient_noise(source)
             try:
                 audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=10) 
             except sr.WaitTimeoutError:
-                self.log_messages.append("⏰ Timeout vocal atteint. Réessayez.")
-                self.is_listening = False
+                log("⏰ Timeout vocal atteint. Réessayez.")
+                self.ui_events.post(UIEvent.LISTENING_STOPPED)
                 return
             except Exception as e:
-                self.log_messages.append(f"Erreur d'écoute: {e}")
-                self.is_listening = False
+                log(f"Erreur d'écoute: {e}")
+                self.ui_events.post(UIEvent.LISTENING_STOPPED)
                 return
 
         recognized_text = ""
@@ -864,19 +974,31 @@ class LoupGarouGame(arcade.Window):
             # Utilisez l'API Google Speech pour la reconnaissance
             recognized_text = self.recognizer.recognize_google(audio, language="fr-FR")
             
-            self.chat_input.text = recognized_text
-            self.log_messages.append(f"✅ Reconnaissance vocale : {recognized_text[:40]}...")
+            self.ui_events.post(UIEvent.SPEECH_RECOGNIZED, text=recognized_text)
 
         except sr.UnknownValueError:
-            self.log_messages.append("❌ Je n'ai pas compris la parole. Réessayez.")
+            log("❌ Je n'ai pas compris la parole. Réessayez.")
         except sr.RequestError as e:
-            self.log_messages.append(f"❌ Erreur de l'API Google Speech : {e}")
+            log(f"❌ Erreur de l'API Google Speech : {e}")
         finally:
-            self.is_listening = False
+            self.ui_events.post(UIEvent.LISTENING_STOPPED)
+
+    def _on_speech_recognized(self, data):
+        """Place la phrase reconnue dans le champ de chat."""
+        self.chat_input.text = data["text"]
+        self.log_messages.append(f"✅ Reconnaissance vocale : {data['text'][:40]}...")
+
+    def _dispatch_ui_events(self):
+        """Applique les événements des threads de travail (au plus UI_EVENTS_PER_FRAME par image)."""
+        for event_type, data in self.ui_events.drain(self.UI_EVENTS_PER_FRAME):
+            self.ui_event_handlers[event_type](data)
 
 
     def on_resize(self, width, height):
         super().on_resize(width, height)
+        # Largeurs du journal et positions dépendent de la taille de la fenêtre
+        self.text_layer.clear()
+        self._indicators_state = None
         self._setup_ui_elements()
 
         if self.game_manager is not None:
@@ -894,6 +1016,28 @@ class LoupGarouGame(arcade.Window):
             self.menu_bg_sprite.center_x = width / 2
             self.menu_bg_sprite.center_y = height / 2
 
+    def on_close(self):
+        """Arrête les workers du débat et de la nuit sans attendre la réponse du LLM en cours."""
+        self.debate_executor.shutdown(wait=False, cancel_futures=True)
+        self.night_worker.shutdown()
+        if self.game_manager is not None:
+            self.game_manager.close()
+        self.log_messages.close()
+        super().on_close()
+
+    def on_mouse_scroll(self, x, y, scroll_x, scroll_y):
+        """Fait défiler le journal de bord (molette au-dessus du panneau de gauche)."""
+        if x <= 10 + self.width // 6:
+            offset = self._log_scroll_offset()
+            offset = max(0, min(len(self.log_messages) - 1, offset + int(scroll_y)))
+            self.log_scroll_anchor = self.log_messages.total - offset if offset else None
+
+    def _log_scroll_offset(self):
+        """Nombre de messages récents masqués, ancré sur le message affiché (pas sur le plus récent)."""
+        if self.log_scroll_anchor is None:
+            return 0
+        return self.log_messages.offset_for(self.log_scroll_anchor)
+
     def on_key_press(self, symbol, modifiers):
         """Gère les entrées clavier (y compris la saisie du chat)."""
 
@@ -957,21 +1101,21 @@ class LoupGarouGame(arcade.Window):
         y_temps = 190         
 
         # --- TITRE ET NOM ---
-        arcade.draw_text("CONFIGURATION", cx, cy + 240, arcade.color.WHITE, 35, anchor_x="center", bold=True)
-        arcade.draw_text(f"Nom : {self.menu_human_name}", cx, cy + 170, arcade.color.CYAN, 22, anchor_x="center")
+        self.text_layer.draw_text("CONFIGURATION", cx, cy + 240, arcade.color.WHITE, 35, anchor_x="center", bold=True)
+        self.text_layer.draw_text(f"Nom : {self.menu_human_name}", cx, cy + 170, arcade.color.CYAN, 22, anchor_x="center")
 
         # --- RÉGLAGES (JOUEURS, LOUPS, IA) ---
-        arcade.draw_text(f"Nombre de joueurs : {self.menu_num_players}", cx, cy + 90, arcade.color.WHITE, 20, anchor_x="center")
+        self.text_layer.draw_text(f"Nombre de joueurs : {self.menu_num_players}", cx, cy + 90, arcade.color.WHITE, 20, anchor_x="center")
         self.btn_minus.draw()
         self.btn_plus.draw()
 
-        arcade.draw_text(f"Nombre de Loups : {self.menu_num_wolves}", cx, cy + 50, arcade.color.RED, 20, anchor_x="center")
+        self.text_layer.draw_text(f"Nombre de Loups : {self.menu_num_wolves}", cx, cy + 50, arcade.color.RED, 20, anchor_x="center")
         self.btn_wolf_minus.draw()
         self.btn_wolf_plus.draw()
 
         diff_text = self.difficulty_levels[self.menu_diff_index]
         diff_color = [arcade.color.GREEN, arcade.color.WHITE, arcade.color.RED][self.menu_diff_index]
-        arcade.draw_text(f"IA : {diff_text}", cx, cy + 10, diff_color, 20, anchor_x="center")
+        self.text_layer.draw_text(f"IA : {diff_text}", cx, cy + 10, diff_color, 20, anchor_x="center")
         self.btn_diff_prev.draw()
         self.btn_diff_next.draw()
 
@@ -979,7 +1123,7 @@ class LoupGarouGame(arcade.Window):
         current_role = self.available_roles[self.menu_role_index]
         role_name = "🎲 Aléatoire" if current_role == "ALEATOIRE" else current_role.value["name"]
         role_color = arcade.color.LIGHT_SKY_BLUE if current_role == "ALEATOIRE" else arcade.color.GOLD
-        arcade.draw_text(f"Rôle souhaité : {role_name}", cx, cy - 40, role_color, 20, anchor_x="center")
+        self.text_layer.draw_text(f"Rôle souhaité : {role_name}", cx, cy - 40, role_color, 20, anchor_x="center")
         self.btn_role_prev.draw()
         self.btn_role_next.draw()
 
@@ -987,7 +1131,7 @@ class LoupGarouGame(arcade.Window):
         self.btn_chaos.color = arcade.color.DARK_RED if self.chaos_mode else arcade.color.GRAY
         self.btn_chaos.draw()
 
-        arcade.draw_text(f"Temps du débat : {self.debate_duration_setup}s", 
+        self.text_layer.draw_text(f"Temps du débat : {self.debate_duration_setup}s", 
                          cx, y_temps - 5, arcade.color.WHITE, 18, 
                          anchor_x="center", bold=True)
         
@@ -1054,10 +1198,10 @@ class LoupGarouGame(arcade.Window):
                     color = arcade.color.YELLOW
             
             # Nom
-            arcade.draw_text(f"{player.name}", sprite.center_x, sprite.center_y + 60, color, 12, anchor_x="center")
+            self.text_layer.draw_text(f"{player.name}", sprite.center_x, sprite.center_y + 60, color, 12, anchor_x="center")
             # Rôle (si mort ou fin de partie)
             if self.current_state == GameState.GAME_OVER or player.is_human:
-                arcade.draw_text(f"Role: {player.role.name}", sprite.center_x, sprite.center_y - 60, arcade.color.YELLOW_GREEN, 10, anchor_x="center")
+                self.text_layer.draw_text(f"Role: {player.role.name}", sprite.center_x, sprite.center_y - 60, arcade.color.YELLOW_GREEN, 10, anchor_x="center")
 
     def _draw_interactive_layer(self):
         """Dessine les éléments avec lesquels l'utilisateur interagit (Boutons, Chat)."""
@@ -1122,6 +1266,7 @@ class LoupGarouGame(arcade.Window):
 
     def on_update(self, delta_time):
         """Logique : mis à jour à chaque image."""
+        self._dispatch_ui_events()
     
         if self.current_state != GameState.SETUP:
             self._update_cupid_visuals()
@@ -1133,8 +1278,7 @@ class LoupGarouGame(arcade.Window):
         if self.current_state == GameState.NIGHT_IA_ACTION:
             if not self.night_processing:
                 self.night_processing = True 
-                thread = threading.Thread(target=self._async_night_ai, daemon=True)
-                thread.start()
+                self._start_night_worker()
         # 4. GESTION DU DÉBAT
         elif self.current_state == GameState.DEBATE:
             self._update_debate(delta_time) 
@@ -1205,9 +1349,9 @@ class LoupGarouGame(arcade.Window):
             self.night_processing = False
 
         elif data == "SAUVER":
-            self.human_player.has_life_potion = False
-            self.game_manager.witch_saved_someone = True 
-            self.log_messages.append("💖 Sorcière : Vous avez utilisé la potion de vie.")
+            # Le moteur consomme (et journalise) la potion si la victime des Loups l'atteint cette nuit
+            self.game_manager.human_action_type = "SAUVER"
+            self.log_messages.append("💖 Sorcière : Vous utiliserez la potion de vie sur la victime des Loups.")
             self.current_state = GameState.NIGHT_IA_ACTION
             self.night_processing = False
 
@@ -1250,41 +1394,106 @@ class LoupGarouGame(arcade.Window):
         return False
 
     def _process_message_typing(self):
-        """Ajoute les caractères un par un au message affiché."""
+        """Ajoute les caractères un par un au message affiché, au rythme où le stream les fournit."""
+        speech = self.current_speech
+        # `done` est lu AVANT `text` : le thread de débat écrit le dernier morceau puis `done`,
+        # donc un message vu terminé a forcément son texte complet (jamais journalisé tronqué)
+        done = speech is None or speech.done
+        if speech is not None:
+            self.current_message_full = speech.text
+            if done and not speech.announced:
+                self._announce_speech(speech)
+
         self.typing_speed_counter += 1
         if self.typing_speed_counter >= self.typing_delay:
             current_len = len(self.current_message_display)
             if current_len < len(self.current_message_full):
                 self.current_message_display += self.current_message_full[current_len]
-            else:
+            elif done:
                 self.log_messages.append(f"🗣️ {self.current_speaker.name}: {self.current_message_full}")
                 self.message_is_complete = True
             self.typing_speed_counter = 0
 
     def _start_new_ai_speech(self):
-        """Sélectionne une IA vivante pour générer un nouveau message de débat."""
-        self.current_speaker = None
-        self.current_message_full = ""
-        self.current_message_display = ""
-        self.message_is_complete = False 
-    
+        """Affiche le prochain message de débat dès que ses premiers mots sont prêts (sans jamais attendre le LLM)."""
         alive_ais = [p for p in self.game_manager.get_alive_players() if not p.is_human]
     
         if not alive_ais or self.messages_generated >= self.max_messages_per_debate:
             self._end_debate_phase()
             return
-        
-        if alive_ais:
-            speaker = random.choice(alive_ais)
-            debate_message = speaker.generate_debate_message(self.game_manager._get_public_status())
-        
-            self.current_speaker = speaker
-            self.current_message_full = debate_message
-        
-            for listener in [p for p in alive_ais if p != speaker]:
-                listener.receive_public_message(speaker.name, debate_message)
-            
-            self.messages_generated += 1
+
+        self._request_next_speech()
+
+        try:
+            speech = self.debate_ready.get_nowait()
+        except queue.Empty:
+            # Message encore en cours de génération : le précédent reste affiché
+            return
+
+        if speech is self.pending_speech:
+            self.pending_speech = None
+        if speech.debate_round != self.debate_round or not speech.speaker.is_alive:
+            return
+
+        self.current_speech = speech
+        self.current_speaker = speech.speaker
+        self.current_message_full = speech.text
+        self.current_message_display = ""
+        self.message_is_complete = False 
+        self.messages_generated += 1
+
+        if speech.done:
+            self._announce_speech(speech)
+
+    def _announce_speech(self, speech):
+        """Transmet le message complet aux autres IA, puis précharge l'orateur suivant."""
+        speech.announced = True
+        alive_ais = [p for p in self.game_manager.get_alive_players() if not p.is_human]
+        for listener in [p for p in alive_ais if p != speech.speaker]:
+            listener.receive_public_message(speech.speaker.name, speech.text)
+
+        # Préchargement : l'orateur suivant prépare sa réponse pendant la frappe de celle-ci
+        self._request_next_speech()
+
+    def _request_next_speech(self):
+        """Choisit le prochain orateur et lance la génération de son message en arrière-plan."""
+        if self.pending_speech is not None or self.messages_generated >= self.max_messages_per_debate:
+            return
+        # L'orateur suivant doit avoir entendu le message en cours avant de répondre
+        if self.current_speech is not None and not self.current_speech.announced:
+            return
+
+        alive_ais = [p for p in self.game_manager.get_alive_players() if not p.is_human]
+        if not alive_ais:
+            return
+
+        speech = DebateSpeech(self.game_manager.rng.choice(alive_ais), self.debate_round)
+        self.pending_speech = speech
+        self.debate_executor.submit(self._generate_speech, speech, self.game_manager._get_public_status())
+
+    def _generate_speech(self, speech, public_status):
+        """
+        (Thread de débat) Génère le message. En mode streaming, le message est déposé dans la file
+        dès le premier morceau et continue de grandir ; sinon il est déposé une fois complet.
+        L'historique de l'orateur n'est modifié que sous son verrou (history_lock) : _announce_speech
+        peut lui transmettre des messages publics depuis le thread de rendu pendant ce temps.
+        """
+        queued = False
+        try:
+            if self.stream_debate and hasattr(speech.speaker, "stream_debate_message"):
+                for chunk in speech.speaker.stream_debate_message(public_status):
+                    speech.text += chunk
+                    if not queued:
+                        self.debate_ready.put(speech)
+                        queued = True
+            else:
+                speech.text = speech.speaker.generate_debate_message(public_status)
+        except Exception as e:
+            print(f"Erreur génération du débat : {e}")
+            speech.text = speech.text or "..."
+        speech.done = True
+        if not queued:
+            self.debate_ready.put(speech)
 
     def _end_debate_phase(self):
         """Nettoie l'état du débat et bascule vers la phase de vote."""
@@ -1295,6 +1504,11 @@ class LoupGarouGame(arcade.Window):
         self.message_is_complete = False 
         self.log_messages.append("\n🗳️ FIN DU DÉBAT. PLACE AU VOTE.")
         self.messages_generated = 0 
+
+        # Les messages encore en préparation appartiennent au débat terminé
+        self.debate_round += 1
+        self.pending_speech = None
+        self.current_speech = None
     
         if self.human_player.is_alive:
             self.enter_human_voting_state() 
@@ -1345,14 +1559,17 @@ class LoupGarouGame(arcade.Window):
         y_pos = self.height - 30 
         line_spacing = 70 
         
-        arcade.draw_text("JOURNAL DE BORD:", x_pos, y_pos, arcade.color.ORANGE_RED, 14)
+        title = "JOURNAL DE BORD:"
+        log_scroll = self._log_scroll_offset()
+        if log_scroll:
+            title += f" (↑ {log_scroll})"
+        self.text_layer.draw_text(title, x_pos, y_pos, arcade.color.ORANGE_RED, 14)
         y_pos -= 35 
         
-        for msg in reversed(self.log_messages):
-            if y_pos < 40: 
-                break
-            
-            arcade.draw_text(
+        # Seuls les messages visibles sont lus dans le journal (coût indépendant de sa taille)
+        visible = max(0, int(y_pos - 40) // line_spacing + 1)
+        for msg in self.log_messages.window(visible, log_scroll):
+            self.text_layer.draw_text(
                 msg, 
                 x_pos, 
                 y_pos, 
@@ -1370,27 +1587,35 @@ class LoupGarouGame(arcade.Window):
         RIGHT_PANEL_START_X = self.width - PANEL_WIDTH
 
         phase_text = f"JOUR {self.game_manager.day}" if not self.night_processing else f"NUIT {self.game_manager.day}"
-        arcade.draw_text(phase_text, RIGHT_PANEL_START_X + 20, self.height - 90, arcade.color.AQUA, 14, bold=True)
+        self.text_layer.draw_text(phase_text, RIGHT_PANEL_START_X + 20, self.height - 90, arcade.color.AQUA, 14, bold=True)
+
+        # Progression de la nuit calculée en arrière-plan (action en cours parmi NIGHT_STEPS)
+        if self.night_processing and self.night_action in self.NIGHT_STEPS:
+            step = self.NIGHT_STEPS.index(self.night_action) + 1
+            self.text_layer.draw_text(
+                f"🌙 {self.night_action.name} agit... ({step}/{len(self.NIGHT_STEPS)})",
+                RIGHT_PANEL_START_X + 20, self.height - 115, arcade.color.LIGHT_GRAY, 12
+            )
         
-        arcade.draw_text(
+        self.text_layer.draw_text(
             f"Loups Vivants : {self.game_manager.wolves_alive}",
             RIGHT_PANEL_START_X + 20, self.height - 30, arcade.color.WHITE, 16
         )
         
         if self.current_state in [GameState.DEBATE, GameState.VOTING, GameState.HUMAN_ACTION]:
-             arcade.draw_text(
+             self.text_layer.draw_text(
                 f"Temps Restant : {int(self.debate_timer)}s",
                 RIGHT_PANEL_START_X + 20, self.height - 60, arcade.color.YELLOW, 14
             )
         
         if self.current_state == GameState.NIGHT_HUMAN_ACTION:
              action_text = f"ACTION NOCTURNE REQUISE ({self.human_player.role.name})"
-             arcade.draw_text(
+             self.text_layer.draw_text(
                 action_text,
                 RIGHT_PANEL_START_X + 20, self.height - 200, arcade.color.ORANGE, 16
             )
         elif self.current_state == GameState.CUPID_ACTION:
-             arcade.draw_text(
+             self.text_layer.draw_text(
                 f"PHASE CUPIDON (Sélectionnez 2)",
                 RIGHT_PANEL_START_X + 20, self.height - 200, arcade.color.PINK, 16
             )
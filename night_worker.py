@@ -0,0 +1,58 @@
+# night_worker.py
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class NightWorker:
+    """
+    Calcule les nuits (GameManager._night_phase) sur un thread persistant, réutilisé de nuit en nuit.
+    `start` retourne un Future (message de la nuit, ou None si elle a été annulée) ; la progression
+    est signalée action par action via `on_action(role)`. Chaque nuit dispose de `budget` secondes
+    pour les décisions des IA, au-delà desquelles une décision de secours est prise.
+    Une nuit annulée (`cancel`) finit de s'écouler sur le thread : la nuit suivante peut être lancée
+    tout de suite, elle démarre dès que l'ancienne s'est arrêtée (à sa prochaine action).
+    """
+
+    def __init__(self, budget=45.0):
+        self.budget = budget
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="night")
+        self._stop = threading.Event()
+        self._future = None
+
+    @property
+    def busy(self):
+        return self._future is not None and not self._future.done()
+
+    def start(self, game_manager, on_action=None):
+        """
+        Lance la nuit de cette partie ; retourne son Future.
+        Lève RuntimeError si une nuit non annulée est encore en cours de calcul.
+        """
+        if self.busy and not self._stop.is_set():
+            raise RuntimeError("Une nuit est déjà en cours de calcul.")
+        # Un nouvel évènement par nuit : l'annulation d'une nuit ne déborde pas sur la suivante
+        self._stop = threading.Event()
+        deadline = time.monotonic() + self.budget
+        self._future = self._executor.submit(
+            game_manager._night_phase,
+            on_action=on_action,
+            deadline=deadline,
+            should_stop=self._stop.is_set,
+        )
+        return self._future
+
+    def cancel(self):
+        """
+        Interrompt la nuit en cours (nouvelle partie, fermeture) : elle s'arrête à la prochaine action,
+        sans attendre la décision d'un LLM en cours (abandonnée), et son Future retourne None.
+        """
+        self._stop.set()
+        if self._future is not None:
+            self._future.cancel()
+
+    def shutdown(self):
+        """Annule la nuit en cours et libère le thread (sans l'attendre)."""
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -112,24 +112,28 @@ def get_personality_by_name(name: str) -> Personality | None:
     return None
 
 
-def pick_personality_for_role(role_name: str, bias_probability: float = 0.6) -> Personality:
+def pick_personality_for_role(role_name: str, bias_probability: float = 0.6,
+                              rng: random.Random | None = None) -> Personality:
     """
     Tire une personnalité pour un rôle donné
     - Avec 'bias_probability' on privilégie une personnalité parmi la liste ROLE_TO_PERSONALITIES[role_name]
       si elle existe 60% du temps
     - Le reste du temps, on pioche au hasard dans le pool global
     Résultat : difficile d'associer 'rôle = personnalité' pour les joueurs humains
+    - 'rng' : générateur de la partie (GameManager.rng) pour un tirage reproductible ;
+      sans lui, le module random global est utilisé (tirage non reproductible)
     """
+    rng = rng or random
     preferred_names = ROLE_TO_PERSONALITIES.get(role_name, [])
 
-    use_bias = preferred_names and (random.random() < bias_probability)
+    use_bias = preferred_names and (rng.random() < bias_probability)
 
     if use_bias:
        
-        chosen_name = random.choice(preferred_names)
+        chosen_name = rng.choice(preferred_names)
         personality = get_personality_by_name(chosen_name)
         if personality:
             return personality
 
     
-    return random.choice(PERSONALITIES_POOL)
+    return rng.choice(PERSONALITIES_POOL)
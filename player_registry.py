@@ -0,0 +1,107 @@
+# player_registry.py
+
+from bisect import insort
+from collections import Counter, defaultdict
+
+
+class PlayerRegistry:
+    """
+    Index des joueurs d'une partie, tenus à jour à chaque changement plutôt que recalculés :
+    - nom -> joueur
+    - rôle -> joueurs (dans l'ordre de la table)
+    - joueurs vivants (dans l'ordre de la table)
+    - nombre de vivants par camp (conditions de victoire en temps constant)
+    Les rôles et les morts doivent passer par `set_role` et `mark_dead`.
+    `version` augmente à chaque modification (permet à l'interface d'invalider ses caches).
+    """
+
+    def __init__(self, players=None):
+        self.players = players if players is not None else []
+        self.version = 0
+        self.reindex()
+
+    def reindex(self):
+        """Reconstruit tous les index (après des modifications faites hors du registre)."""
+        self._seat = {p.name: i for i, p in enumerate(self.players)}
+        self._by_name = {p.name: p for p in self.players}
+        self._by_role = defaultdict(list)
+        for p in self.players:
+            if p.role is not None:
+                self._by_role[p.role].append(p)
+        self._alive = {p.name: p for p in self.players if p.is_alive}
+        self._camp_alive = Counter(p.role.camp for p in self._alive.values() if p.role is not None)
+        self.version += 1
+
+    def add(self, player):
+        """Ajoute un joueur en bout de table."""
+        self._seat[player.name] = len(self.players)
+        self.players.append(player)
+        self._by_name[player.name] = player
+        if player.role is not None:
+            self._insert_by_role(player)
+        if player.is_alive:
+            self._alive[player.name] = player
+            if player.role is not None:
+                self._camp_alive[player.role.camp] += 1
+        self.version += 1
+
+    def __len__(self):
+        return len(self.players)
+
+    def __iter__(self):
+        return iter(self.players)
+
+    # --- Lectures (O(1)) ---
+
+    def get(self, name):
+        return self._by_name.get(name)
+
+    def with_role(self, role):
+        """Joueurs ayant ce rôle, morts compris (copie)."""
+        return list(self._by_role.get(role, ()))
+
+    def first_with_role(self, role):
+        players = self._by_role.get(role)
+        return players[0] if players else None
+
+    def alive(self):
+        """Joueurs vivants dans l'ordre de la table (copie)."""
+        return list(self._alive.values())
+
+    def is_alive(self, name):
+        return name in self._alive
+
+    def alive_in_camp(self, camp):
+        """Nombre de joueurs vivants dans ce camp."""
+        return self._camp_alive[camp]
+
+    # --- Écritures ---
+
+    def set_role(self, player, role):
+        """Attribue un rôle au joueur et met à jour l'index des rôles."""
+        old_role = player.role
+        player.assign_role(role)
+        if old_role is not None:
+            players = self._by_role[old_role]
+            if player in players:
+                players.remove(player)
+            if player.is_alive:
+                self._camp_alive[old_role.camp] -= 1
+        self._insert_by_role(player)
+        if player.is_alive:
+            self._camp_alive[role.camp] += 1
+        self.version += 1
+
+    def mark_dead(self, player):
+        """Marque le joueur comme mort. Retourne False s'il l'était déjà."""
+        if not player.is_alive:
+            return False
+        player.is_alive = False
+        self._alive.pop(player.name, None)
+        if player.role is not None:
+            self._camp_alive[player.role.camp] -= 1
+        self.version += 1
+        return True
+
+    def _insert_by_role(self, player):
+        insort(self._by_role[player.role], player, key=lambda p: self._seat[p.name])
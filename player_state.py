@@ -0,0 +1,63 @@
+# player_state.py
+
+from enums_and_roles import Role
+
+
+class Player:
+    """
+    État d'un joueur (humain, ou base de ChatAgent). Tous les champs sont déclarés dans
+    `__slots__` : pas de __dict__ par joueur, mémoire prévisible et accès plus rapides.
+    Un attribut non déclaré lève une AttributeError au lieu d'être ajouté silencieusement.
+    """
+
+    __slots__ = (
+        "name", "is_human", "role", "is_alive",
+        # Pouvoirs
+        "has_kill_potion", "has_life_potion",  # Sorcière
+        "has_hunter_shot",                     # Chasseur
+        "last_protected_target",               # Salvateur
+        "is_ancient_protected",                # Ancien
+        # Situation dans la partie
+        "wolf_teammates", "is_in_love", "has_acted_this_night",
+        "suspicion_score", "votes_received",
+        # Flux aléatoire propre au joueur (dérivé de la graine de la partie)
+        "rng",
+    )
+
+    def __init__(self, name, role=None, is_human=False):
+        self.name = name
+        self.is_human = is_human
+        self.role = None
+        self.is_alive = True
+        # L'humain dispose de ses potions dès sa création ; les IA les reçoivent à la distribution
+        self.has_kill_potion = is_human
+        self.has_life_potion = is_human
+        self.has_hunter_shot = True
+        self.last_protected_target = None
+        self.is_ancient_protected = False
+        self.wolf_teammates = []
+        self.is_in_love = False
+        self.has_acted_this_night = False
+        self.suspicion_score = 0
+        self.votes_received = 0
+        self.rng = None  # Attribué par GameManager aux agents IA
+        if role is not None:
+            self.assign_role(role)
+
+    def assign_role(self, role):
+        self.role = role
+        if role == Role.ANCIEN:
+            self.is_ancient_protected = True
+
+    def __repr__(self):
+        status = "Vivant" if self.is_alive else "Mort"
+        return f"[{'Humain' if self.is_human else 'IA'}] {self.name} ({self.role.name if self.role else 'N/A'} - {status})"
+
+
+def grant_role_powers(player, role):
+    """Initialisation des capacités/potions, une seule fois à la distribution (un échange de rôles ne les recharge pas)."""
+    if role == Role.SORCIERE:
+        player.has_kill_potion = True
+        player.has_life_potion = True
+    elif role == Role.CHASSEUR:
+        player.has_hunter_shot = True
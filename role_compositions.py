@@ -0,0 +1,121 @@
+# role_compositions.py
+
+from enums_and_roles import Camp, Role
+
+
+MIN_PLAYERS = 6    # Bornes du menu de configuration
+MAX_PLAYERS = 15
+MIN_VILLAGERS = 4  # Villageois simples garantis par la composition par défaut
+
+# Rôles spéciaux, par ordre de priorité : les premiers entrent en jeu dès les petites tables
+SPECIAL_ROLES = (
+    Role.VOYANTE, Role.SORCIERE, Role.CHASSEUR,
+    Role.CUPIDON, Role.MAIRE, Role.SALVATEUR, Role.ANCIEN
+)
+
+# Ordre canonique d'une composition : loups, rôles spéciaux par priorité, villageois
+_RANK = {Role.LOUP: 0, **{role: i + 1 for i, role in enumerate(SPECIAL_ROLES)}, Role.VILLAGEOIS: len(SPECIAL_ROLES) + 1}
+
+
+def default_wolves(num_players):
+    """Nombre de loups de la composition par défaut (un 3ème loup au-delà de 10 joueurs)."""
+    return 3 if num_players >= 11 else 2
+
+
+def max_wolves(num_players):
+    """Nombre maximal de loups proposé par le menu."""
+    return num_players // 2
+
+
+def _build_default(num_players):
+    roles = [Role.LOUP] * default_wolves(num_players)
+    num_specials = min(len(SPECIAL_ROLES), max(0, num_players - len(roles) - MIN_VILLAGERS))
+    roles.extend(SPECIAL_ROLES[:num_specials])
+    roles.extend([Role.VILLAGEOIS] * (num_players - len(roles)))
+    return tuple(roles)
+
+
+def _build_for_human(num_players, num_wolves, human_role):
+    # Rôles non-loups de la composition par défaut, moins celui choisi par l'humain
+    pool = [role for role in _build_default(num_players) if role != Role.LOUP]
+    if human_role in pool:
+        pool.remove(human_role)
+
+    wolves = max(0, num_wolves - 1 if human_role == Role.LOUP else num_wolves)
+    roles = [Role.LOUP] * wolves
+    roles.extend(pool[:num_players - 1 - wolves])
+    roles.extend([Role.VILLAGEOIS] * (num_players - 1 - len(roles)))
+    return tuple(roles)
+
+
+def _validate(num_players, num_wolves, roles, where):
+    """Vérifie les invariants d'une composition complète (ValueError sinon)."""
+    wolves = sum(1 for role in roles if role.camp == Camp.LOUP)
+    specials = [role for role in roles if role in SPECIAL_ROLES]
+    problems = []
+    if len(roles) != num_players:
+        problems.append(f"{len(roles)} rôles pour {num_players} joueurs")
+    if wolves != num_wolves or wolves < 1:
+        problems.append(f"{wolves} loups au lieu de {num_wolves}")
+    if num_players - wolves < wolves:
+        problems.append("plus de loups que de villageois")
+    if len(specials) != len(set(specials)):
+        problems.append("rôle spécial en double")
+    if problems:
+        raise ValueError(f"Composition invalide {where} : " + ", ".join(problems))
+
+
+def _check_order(roles, where):
+    if list(roles) != sorted(roles, key=_RANK.__getitem__):
+        raise ValueError(f"Composition invalide {where} : rôles spéciaux hors de l'ordre de priorité")
+
+
+def _build_catalog():
+    defaults = {}
+    for_human = {}
+    for num_players in range(MIN_PLAYERS, MAX_PLAYERS + 1):
+        roles = _build_default(num_players)
+        where = f"({num_players} joueurs)"
+        _validate(num_players, default_wolves(num_players), roles, where)
+        _check_order(roles, where)
+        roles_without_specials = [role for role in roles if role not in SPECIAL_ROLES]
+        if roles_without_specials.count(Role.VILLAGEOIS) < MIN_VILLAGERS:
+            raise ValueError(f"Composition invalide {where} : moins de {MIN_VILLAGERS} villageois")
+        defaults[num_players] = roles
+
+        for num_wolves in range(1, max_wolves(num_players) + 1):
+            for human_role in Role:
+                ai_roles = _build_for_human(num_players, num_wolves, human_role)
+                where = f"({num_players} joueurs, {num_wolves} loups, humain {human_role.name})"
+                _validate(num_players, num_wolves, ai_roles + (human_role,), where)
+                _check_order(ai_roles, where)
+                for_human[(num_players, num_wolves, human_role)] = ai_roles
+    return defaults, for_human
+
+
+# Catalogue calculé (et vérifié) une seule fois, à l'import
+DEFAULT_COMPOSITIONS, HUMAN_CHOICE_COMPOSITIONS = _build_catalog()
+
+
+def default_composition(num_players):
+    """Composition complète par défaut pour `num_players` joueurs (tuple de Role, ordre canonique)."""
+    try:
+        return DEFAULT_COMPOSITIONS[num_players]
+    except KeyError:
+        raise ValueError(
+            f"Nombre de joueurs non supporté : {num_players} (de {MIN_PLAYERS} à {MAX_PLAYERS})."
+        ) from None
+
+
+def composition_for_human(num_players, num_wolves, human_role):
+    """
+    Rôles des IA (num_players - 1, ordre canonique) quand l'humain a choisi son rôle
+    et le nombre total de loups dans le menu.
+    """
+    try:
+        return HUMAN_CHOICE_COMPOSITIONS[(num_players, num_wolves, human_role)]
+    except KeyError:
+        raise ValueError(
+            f"Composition non supportée : {num_players} joueurs, {num_wolves} loups "
+            f"(de {MIN_PLAYERS} à {MAX_PLAYERS} joueurs, de 1 à la moitié des joueurs en loups)."
+        ) from None
@@ -0,0 +1,46 @@
+# seeded_random.py
+
+import random
+
+
+class SeededRandom(random.Random):
+    """
+    random.Random (même Mersenne Twister, mêmes tirages pour une même graine) qui compte les mots
+    de 32 bits consommés. Son état tient en deux entiers (graine, compteur) au lieu des 625 mots
+    du générateur : une sauvegarde le reconstruit en resemant puis en avançant du compteur.
+    Tous les tirages de random.Random passent par random() (2 mots) ou getrandbits() ; seul le
+    second tirage mis en cache par gauss() n'est pas suivi (gauss n'est pas utilisé par le jeu).
+    """
+
+    def __init__(self, seed=None):
+        self.words = 0
+        super().__init__(seed)
+
+    def seed(self, a=None, version=2):
+        if a is None:
+            a = random.SystemRandom().getrandbits(64)
+        if not isinstance(a, int):
+            raise TypeError("SeededRandom n'accepte qu'une graine entière.")
+        self.initial_seed = a
+        self.words = 0
+        super().seed(a, version)
+
+    def random(self):
+        self.words += 2
+        return super().random()
+
+    def getrandbits(self, k):
+        self.words += (k + 31) // 32
+        return super().getrandbits(k)
+
+    def state(self):
+        """État compact : [graine, mots consommés]."""
+        return [self.initial_seed, self.words]
+
+    @classmethod
+    def from_state(cls, state):
+        seed, words = state
+        rng = cls(seed)
+        if words:
+            rng.getrandbits(32 * words)  # Avance d'un bloc : getrandbits(32 * n) consomme exactement n mots
+        return rng
@@ -0,0 +1,288 @@
+# simulation.py
+
+import time
+import argparse
+
+from enums_and_roles import Camp, NightAction, Role
+from game_core import GameManager, Player
+
+
+# Rôles proposés au joueur humain (comme dans le menu de loup_garou_arcade.py)
+HUMAN_ROLES = [
+    Role.VILLAGEOIS, Role.LOUP, Role.VOYANTE, Role.SORCIERE,
+    Role.CHASSEUR, Role.CUPIDON, Role.SALVATEUR, Role.ANCIEN
+]
+
+RANDOM_DEBATE_LINES = [
+    "{target} est bien trop silencieux, c'est suspect.",
+    "Je ne fais pas confiance à {target}.",
+    "Pourquoi {target} change-t-il d'avis à chaque tour ?",
+    "Je suis innocent, regardez plutôt du côté de {target} !",
+]
+
+
+class RandomAgent(Player):
+    """
+    Joueur IA sans LLM : décisions aléatoires instantanées.
+    Même interface que ChatAgent, pour les simulations massives (équilibrage, tests de charge).
+    """
+
+    __slots__ = ("history",)
+
+    # Pas de LLM, donc pas de fichier de personnalité à créer dans context/
+    uses_personality_file = False
+
+    def __init__(self, name, personality_context_path=None):
+        super().__init__(name, is_human=False)
+        self.history = []
+
+    def on_new_day(self, day):
+        pass
+
+    def receive_public_message(self, sender_name, message):
+        pass
+
+    def decide_night_action(self, alive_players):
+        if self.role.night_action == NightAction.NONE:
+            return None
+        targets = [p.name for p in alive_players if p.name != self.name]
+        if self.role.camp == Camp.LOUP:
+            # Un loup ne mange pas ses coéquipiers
+            targets = [p.name for p in alive_players if p.role.camp != Camp.LOUP] or targets
+        return self.rng.choice(targets) if targets else None
+
+    def generate_debate_message(self, current_game_status):
+        alive_names = [p['name'] for p in current_game_status if p['is_alive'] and p['name'] != self.name]
+        if not alive_names:
+            return "..."
+        return self.rng.choice(RANDOM_DEBATE_LINES).format(target=self.rng.choice(alive_names))
+
+    def decide_vote(self, public_status, debate_summary):
+        alive_names = [p['name'] for p in public_status if p['is_alive'] and p['name'] != self.name]
+        return self.rng.choice(alive_names) if alive_names else None
+
+
+class RandomPolicy:
+    """Politique par défaut du siège humain : choix aléatoires parmi les actions légales."""
+
+    def choose_lovers(self, game_manager):
+        names = [p.name for p in game_manager.get_alive_players()]
+        return game_manager.rng.sample(names, 2)
+
+    def night_action(self, game_manager, player):
+        """Retourne (human_choice, human_action_type) pour la nuit en cours."""
+        alive = game_manager.get_alive_players()
+        if player.role == Role.SALVATEUR:
+            targets = [p.name for p in alive if p.name != player.last_protected_target]
+            return (game_manager.rng.choice(targets) if targets else None), None
+        if player.role.camp == Camp.LOUP:
+            targets = [p.name for p in alive if p.role.camp != Camp.LOUP]
+            return (game_manager.rng.choice(targets) if targets else None), None
+        if player.role == Role.SORCIERE and player.has_life_potion and game_manager.rng.random() < 0.5:
+            return None, "SAUVER"
+        return None, None
+
+    def debate_message(self, game_manager, player):
+        """Message public du joueur humain pendant le débat (None pour se taire)."""
+        return None
+
+    def vote(self, game_manager, player):
+        targets = [p.name for p in game_manager.get_alive_players() if p.name != player.name]
+        return game_manager.rng.choice(targets) if targets else None
+
+
+class HeadlessGame:
+    """
+    Pilote une partie de GameManager sans interface graphique.
+    Enchaîne les phases Cupidon, nuit, débat, vote et résultat comme LoupGarouGame.on_update,
+    mais aussi vite que les agents répondent. `step()` exécute une phase, `run()` joue jusqu'à la fin.
+    """
+
+    def __init__(self, num_players=8, num_wolves=2, difficulty="NORMAL", human_role=None,
+                 seed=None, agent_factory=None, policy=None, debate_messages=4,
+                 max_days=30, human_name="Lucie", concurrent_votes=True, event_sink=None):
+        self.game_manager = GameManager(
+            human_player_name=human_name,
+            num_players_total=num_players,
+            difficulty=difficulty,
+            seed=seed,
+            agent_factory=agent_factory,
+            event_sink=event_sink
+        )
+        self._configure(policy, debate_messages, max_days, concurrent_votes)
+
+        human_role = human_role or self.game_manager.rng.choice(HUMAN_ROLES)
+        self.human_player.assign_role(human_role)
+        self.game_manager._distribute_roles_after_human_choice(human_role, num_wolves_chosen=num_wolves)
+
+        self.phase = "CUPIDON"
+
+    @classmethod
+    def resume(cls, game_manager, phase="NIGHT", policy=None, debate_messages=4, max_days=30,
+               concurrent_votes=True):
+        """Reprend une partie existante (ex. restaurée par game_snapshot) à la phase donnée."""
+        game = cls.__new__(cls)
+        game.game_manager = game_manager
+        game._configure(policy, debate_messages, max_days, concurrent_votes)
+        game.phase = phase
+        return game
+
+    def _configure(self, policy, debate_messages, max_days, concurrent_votes):
+        # Les votes en parallèle n'apportent rien à des agents instantanés (coût des threads)
+        self.game_manager.CONCURRENT_VOTES = concurrent_votes
+        self.policy = policy or RandomPolicy()
+        self.debate_messages = debate_messages
+        self.max_days = max_days
+        self.log_messages = []
+        self.winner = None
+        self.human_player = self.game_manager.human_player
+
+    @property
+    def is_over(self):
+        return self.phase == "GAME_OVER"
+
+    def step(self):
+        """Exécute la phase courante et passe à la suivante. Retourne le nom de la phase jouée."""
+        phase = self.phase
+        handler = {
+            "CUPIDON": self._cupid_phase,
+            "NIGHT": self._night_phase,
+            "DEBATE": self._debate_phase,
+            "VOTE": self._vote_phase,
+        }.get(phase)
+        if handler:
+            handler()
+        return phase
+
+    def run(self):
+        """Joue la partie jusqu'à la victoire d'un camp (ou max_days). Retourne le résultat."""
+        started = time.perf_counter()
+        while not self.is_over:
+            self.step()
+        return self.result(time.perf_counter() - started)
+
+    def result(self, duration=None):
+        """Résumé sérialisable de la partie (gagnant, durée, rôles et survivants)."""
+        gm = self.game_manager
+        return {
+            "seed": gm.seed,
+            "num_players": gm.num_players_total,
+            "difficulty": gm.difficulty,
+            "winner": self.winner.value if self.winner else None,
+            "days": gm.day,
+            "duration": duration,
+            "roles": {p.name: p.role.name for p in gm.players},
+            "human_role": self.human_player.role.name,
+            "survivors": [p.name for p in gm.get_alive_players()],
+        }
+
+    # --- Phases ---
+
+    def _cupid_phase(self):
+        gm = self.game_manager
+        cupidon = gm.get_player_by_role(Role.CUPIDON)
+        if cupidon and cupidon.is_human:
+            name1, name2 = self.policy.choose_lovers(gm)
+            self.log_messages.append(gm.bind_lovers(name1, name2))
+            gm.is_cupid_phase_done = True
+        elif cupidon:
+            self.log_messages.append(gm._handle_cupid_phase())
+        gm.day = 1
+        self.phase = "NIGHT"
+
+    def _night_phase(self):
+        gm = self.game_manager
+        human = self.human_player
+        if human.is_alive and human.role.night_action != NightAction.NONE and gm.day > 1:
+            gm.human_choice, gm.human_action_type = self.policy.night_action(gm, human)
+
+        self.log_messages.append(gm._night_phase())
+        gm.start_new_day()
+        gm.hunter_just_shot = False
+        gm.ancient_shield_triggered = False
+
+        if not self._check_end():
+            self.phase = "DEBATE"
+
+    def _debate_phase(self):
+        gm = self.game_manager
+        alive_ais = [p for p in gm.get_alive_players() if not p.is_human]
+
+        if self.human_player.is_alive:
+            message = self.policy.debate_message(gm, self.human_player)
+            if message:
+                self._broadcast(self.human_player, message, alive_ais)
+
+        for _ in range(self.debate_messages if alive_ais else 0):
+            speaker = gm.rng.choice(alive_ais)
+            message = speaker.generate_debate_message(gm._get_public_status())
+            self._broadcast(speaker, message, alive_ais)
+        self.phase = "VOTE"
+
+    def _broadcast(self, speaker, message, listeners):
+        self.log_messages.append(f"🗣️ {speaker.name}: {message}")
+        for listener in listeners:
+            if listener is not speaker:
+                listener.receive_public_message(speaker.name, message)
+
+    def _vote_phase(self):
+        gm = self.game_manager
+        if self.human_player.is_alive:
+            gm.register_human_vote(self.policy.vote(gm, self.human_player))
+        else:
+            gm._voting_phase_ia_only()
+
+        self.log_messages.append(gm._lynch_result(gm.get_alive_players()))
+        gm.hunter_just_shot = False
+        gm.ancient_shield_triggered = False
+
+        if not self._check_end():
+            self.phase = "NIGHT"
+
+    def _check_end(self):
+        self.winner = self.game_manager.check_win_condition()
+        if self.winner or self.game_manager.day >= self.max_days:
+            self.phase = "GAME_OVER"
+            return True
+        return False
+
+
+def chat_agent_factory(backend=None):
+    """Fabrique de ChatAgent branchés sur un backend donné (ScriptedBackend, serveur local...)."""
+    from chat_agent import ChatAgent
+
+    def factory(name, personality_context_path):
+        return ChatAgent(name, personality_context_path, backend=backend)
+    return factory
+
+
+def make_agent_factory(agents="random"):
+    """Fabrique de joueurs IA : "random" (sans LLM) ou "llm" (ChatAgent sur le backend partagé)."""
+    if agents == "random":
+        return RandomAgent
+    if agents == "llm":
+        return chat_agent_factory()
+    raise ValueError(f"Type d'agents inconnu : {agents}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parties de Loup Garou sans interface graphique.")
+    parser.add_argument("--games", type=int, default=1)
+    parser.add_argument("--players", type=int, default=8)
+    parser.add_argument("--wolves", type=int, default=2)
+    parser.add_argument("--difficulty", default="NORMAL")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--agents", choices=["random", "llm"], default="random")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    factory = make_agent_factory(args.agents)
+    for i in range(args.games):
+        seed = None if args.seed is None else args.seed + i
+        game = HeadlessGame(num_players=args.players, num_wolves=args.wolves, difficulty=args.difficulty,
+                            seed=seed, agent_factory=factory, concurrent_votes=args.agents != "random")
+        result = game.run()
+        if args.verbose:
+            print("\n".join(str(m) for m in game.log_messages))
+        print(f"Partie {i + 1} : victoire {result['winner']} au jour {result['days']} "
+              f"({result['duration']:.3f}s)")
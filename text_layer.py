@@ -0,0 +1,45 @@
+# text_layer.py
+
+from collections import OrderedDict
+
+import arcade
+
+
+class TextLayer:
+    """
+    Textes retenus d'une image à l'autre : un arcade.Text par texte, style et position distincts.
+    arcade.draw_text partage un seul label par style et refait la mise en page dès que le texte
+    change, donc à chaque appel quand plusieurs textes alternent ; ici, la mise en page n'a lieu
+    qu'à la création et un texte déjà vu est seulement redessiné. La position fait partie de la clé :
+    déplacer un label refait aussi sa mise en page, et un même texte affiché à deux endroits dans
+    une image (ex. deux lignes identiques du journal) aurait sinon été déplacé deux fois par image.
+    Les textes non utilisés depuis longtemps sont oubliés au-delà de `max_items` (LRU).
+    """
+
+    def __init__(self, max_items=256):
+        self.max_items = max_items
+        self._texts = OrderedDict()
+
+    def __len__(self):
+        return len(self._texts)
+
+    def get(self, text, x, y, color=arcade.color.WHITE, font_size=12, **style):
+        """Retourne l'arcade.Text de ce texte/style en (x, y), créé au premier appel."""
+        key = (text, x, y, tuple(color), font_size, tuple(sorted(style.items())))
+        label = self._texts.get(key)
+        if label is None:
+            label = arcade.Text(text, x, y, color, font_size, **style)
+            self._texts[key] = label
+            if len(self._texts) > self.max_items:
+                self._texts.popitem(last=False)
+        else:
+            self._texts.move_to_end(key)
+        return label
+
+    def draw_text(self, text, x, y, color=arcade.color.WHITE, font_size=12, **style):
+        """Même usage qu'arcade.draw_text, avec le texte mis en cache."""
+        self.get(str(text), x, y, color, font_size, **style).draw()
+
+    def clear(self):
+        """Oublie tous les textes (ex. après un redimensionnement : largeurs et positions changent)."""
+        self._texts.clear()
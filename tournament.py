@@ -0,0 +1,137 @@
+# tournament.py
+
+import os
+import time
+import argparse
+import itertools
+from collections import defaultdict
+from multiprocessing import Pool
+
+from role_compositions import max_wolves
+from simulation import HeadlessGame, make_agent_factory
+
+
+def make_specs(games, players=(8,), wolves=(2,), difficulties=("NORMAL",), seed=0, agents="random"):
+    """
+    Génère `games` descriptions de parties (graine, joueurs, loups, difficulté) en parcourant
+    toutes les combinaisons des paramètres fournis, chaque partie ayant sa propre graine.
+    """
+    combos = itertools.cycle(itertools.product(players, wolves, difficulties))
+    specs = []
+    for i, (num_players, num_wolves, difficulty) in zip(range(games), combos):
+        specs.append({
+            "seed": seed + i,
+            "num_players": num_players,
+            "num_wolves": min(num_wolves, max_wolves(num_players)),
+            "difficulty": difficulty,
+            "agents": agents,
+        })
+    return specs
+
+
+def play_game(spec):
+    """(Processus de travail) Joue une partie complète et retourne son résultat."""
+    agents = spec.get("agents", "random")
+    game = HeadlessGame(
+        num_players=spec["num_players"],
+        num_wolves=spec["num_wolves"],
+        difficulty=spec["difficulty"],
+        seed=spec["seed"],
+        agent_factory=make_agent_factory(agents),
+        concurrent_votes=agents != "random",
+    )
+    try:
+        result = game.run()
+    finally:
+        game.game_manager.close()
+    result["num_wolves"] = spec["num_wolves"]
+    return result
+
+
+def run_tournament(specs, processes=None, chunksize=None):
+    """
+    Répartit les parties sur un pool de processus (un par cœur par défaut) et
+    produit les résultats au fur et à mesure qu'elles se terminent.
+    """
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        for spec in specs:
+            yield play_game(spec)
+        return
+
+    # Des lots de parties amortissent le coût des échanges entre processus
+    chunksize = chunksize or max(1, len(specs) // (processes * 8))
+    with Pool(processes) as pool:
+        yield from pool.imap_unordered(play_game, specs, chunksize=chunksize)
+
+
+class TournamentStats:
+    """Agrège les résultats : taux de victoire par camp et par rôle (un rôle gagne avec son camp)."""
+
+    def __init__(self):
+        self.games = 0
+        self.unfinished = 0
+        self.total_days = 0
+        self.camp_wins = defaultdict(int)
+        self.role_played = defaultdict(int)
+        self.role_wins = defaultdict(int)
+
+    def add(self, result, role_camps):
+        self.games += 1
+        self.total_days += result["days"]
+        winner = result["winner"]
+        if winner is None:
+            self.unfinished += 1
+        else:
+            self.camp_wins[winner] += 1
+
+        for role_name in result["roles"].values():
+            self.role_played[role_name] += 1
+            if winner is not None and role_camps[role_name] == winner:
+                self.role_wins[role_name] += 1
+
+    def camp_win_rates(self):
+        return {camp: wins / self.games for camp, wins in self.camp_wins.items()} if self.games else {}
+
+    def role_win_rates(self):
+        return {role: self.role_wins[role] / played for role, played in self.role_played.items()}
+
+    def format(self):
+        lines = [f"{self.games} parties, {self.unfinished} sans vainqueur, "
+                 f"durée moyenne {self.total_days / max(1, self.games):.1f} jours"]
+        for camp, rate in sorted(self.camp_win_rates().items()):
+            lines.append(f"  Victoires {camp} : {rate:.1%}")
+        for role, rate in sorted(self.role_win_rates().items(), key=lambda item: -item[1]):
+            lines.append(f"  {role:<12} : {rate:.1%} ({self.role_played[role]} joués)")
+        return "\n".join(lines)
+
+
+def _role_camps():
+    from enums_and_roles import Role
+    return {role.name: role.camp.value for role in Role}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tournoi de parties de Loup Garou sur tous les cœurs.")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--players", type=int, nargs="+", default=[8])
+    parser.add_argument("--wolves", type=int, nargs="+", default=[2])
+    parser.add_argument("--difficulty", nargs="+", default=["NORMAL"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--agents", choices=["random", "llm"], default="random")
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    specs = make_specs(args.games, args.players, args.wolves, args.difficulty, args.seed, args.agents)
+    stats = TournamentStats()
+    role_camps = _role_camps()
+
+    started = time.perf_counter()
+    for result in run_tournament(specs, processes=args.processes):
+        stats.add(result, role_camps)
+        if stats.games % max(1, args.games // 10) == 0:
+            print(f"... {stats.games}/{args.games} parties terminées")
+    elapsed = time.perf_counter() - started
+
+    print(stats.format())
+    print(f"Temps total : {elapsed:.2f}s ({stats.games / elapsed:.0f} parties/s)")